@@ -3,10 +3,11 @@
 
 from __future__ import annotations
 
+from typing import Iterable
+
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
-from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.spinner import SPINNERS
 from rich import box
 
@@ -86,11 +87,13 @@ def print_panel(content: str, title: str, border_style: str = "blue"):
     console.print(Panel(content, title=f"[bold]{title}[/bold]", border_style=border_style))
 
 
-def create_key_value_table() -> Table:
-    """Create a table for key-value pairs (no headers)."""
+def create_key_value_table(rows: Iterable[tuple[str, str]] = ()) -> Table:
+    """Create a table for key-value pairs (no headers), optionally filled with rows."""
     table = Table(show_header=False, box=None, padding=(0, 2))
     table.add_column("Key", style="dim")
     table.add_column("Value")
+    for key, value in rows:
+        table.add_row(key, value)
     return table
 
 
@@ -129,23 +132,31 @@ def format_highlight(text: str) -> str:
     return f"[cyan]{text}[/cyan]"
 
 
+# Markup tags for format_value(); unknown styles (and "default") leave text as-is
+_VALUE_STYLES = {
+    "success": "green",
+    "error": "red",
+    "warning": "yellow",
+    "highlight": "cyan",
+    "bold": "bold",
+    "dim": "dim",
+    "magenta": "bold magenta",
+}
+
+
 def format_value(text: str, style: str = "default") -> str:
     """Format a value with the given style."""
-    styles = {
-        "default": text,
-        "success": f"[green]{text}[/green]",
-        "error": f"[red]{text}[/red]",
-        "warning": f"[yellow]{text}[/yellow]",
-        "highlight": f"[cyan]{text}[/cyan]",
-        "bold": f"[bold]{text}[/bold]",
-        "dim": f"[dim]{text}[/dim]",
-        "magenta": f"[bold magenta]{text}[/bold magenta]",
-    }
-    return styles.get(style, text)
+    tag = _VALUE_STYLES.get(style)
+    if tag is None:
+        return text
+    return f"[{tag}]{text}[/{tag}]"
 
 
 def get_progress_spinner():
     """Get a progress spinner context manager with custom WTP! branding."""
+    # rich.progress is only needed by commands that show a spinner
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+
     return Progress(
         SpinnerColumn(spinner_name="wtp"),
         TextColumn("[progress.description]{task.description}"),
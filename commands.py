@@ -10,16 +10,17 @@ This module contains all the CLI command implementations:
 
 from __future__ import annotations
 
+import copy
+import io
 import os
 import re
 import shutil
 import subprocess
 import sys
+from functools import lru_cache
+from typing import Callable
 from pathlib import Path
 
-import requests
-import yaml
-
 from cli_utils import (
     console,
     print_error,
@@ -66,8 +67,224 @@ def _get_install_dir() -> Path:
     return INSTALL_DIR
 
 
+def _rewrite_config(
+    config_path: Path,
+    pattern: str,
+    replacement: str,
+    section: str | None = None,
+) -> bool:
+    """
+    Rewrite matching lines of config.yaml in a single streaming pass.
+
+    Lines are copied into a sibling temp file which then replaces the config
+    atomically, so comments and formatting are preserved and an interrupted
+    write never leaves a truncated config behind.
+
+    Args:
+        config_path: Path to config.yaml
+        pattern: Regex matched against each line (without its line ending)
+        replacement: Replacement template passed to re.sub
+        section: If given, only the first matching line after this section's
+            header (e.g. "claude-api:") is rewritten
+
+    Returns:
+        True if the file was changed, False if no line matched
+    """
+    return _rewrite_config_many(config_path, [(pattern, replacement, section)])[0]
+
+
+def _rewrite_config_many(
+    config_path: Path,
+    edits: list[tuple[str, str, str | None]],
+    check: Callable[[list[bool]], bool] | None = None,
+) -> list[bool]:
+    """
+    Apply several _rewrite_config edits in one streaming pass and one write.
+
+    Args:
+        config_path: Path to config.yaml
+        edits: (pattern, replacement, section) tuples, as for _rewrite_config
+        check: Called with the per-edit flags before the config is replaced.
+            It may raise to abort the write, or return False to discard the
+            rewritten copy; either way config.yaml is left untouched.
+
+    Returns:
+        One flag per edit, True if that edit changed a line. The file is only
+        replaced if at least one edit changed something (and check allowed it).
+    """
+    compiled = [
+        (
+            re.compile(pattern),
+            replacement,
+            re.compile(rf'^\s*{re.escape(section)}:\s*$') if section else None,
+        )
+        for pattern, replacement, section in edits
+    ]
+    in_section = [section_pattern is None for _, _, section_pattern in compiled]
+    changed = [False] * len(compiled)
+
+    tmp_path = Path(f"{config_path}.tmp")
+    try:
+        with open(config_path, 'r', buffering=io.DEFAULT_BUFFER_SIZE) as src, \
+                open(tmp_path, 'w', buffering=io.DEFAULT_BUFFER_SIZE) as dst:
+            for line in src:
+                body = line.rstrip("\r\n")
+                ending = line[len(body):]
+
+                for i, (line_pattern, replacement, section_pattern) in enumerate(compiled):
+                    if section_pattern is not None and section_pattern.match(body):
+                        in_section[i] = True
+                    elif in_section[i] and line_pattern.match(body):
+                        new_body = line_pattern.sub(replacement, body, count=1)
+                        changed[i] = changed[i] or new_body != body
+                        body = new_body
+                        if section_pattern is not None:
+                            in_section[i] = False
+
+                dst.write(body + ending)
+
+        if (check is not None and not check(changed)) or not any(changed):
+            tmp_path.unlink()
+            return changed
+
+        shutil.copymode(config_path, tmp_path)
+        os.replace(tmp_path, config_path)
+        return changed
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+class ConfigSession:
+    """
+    Collects config.yaml changes from the switch commands and writes them once.
+
+    Each switch records its change with set(); the in-memory config reflects
+    it straight away (so --switch-model run after --switch-engine targets the
+    new engine) and the file is rewritten in a single pass by save(), which
+    also prints the queued success messages.
+    """
+
+    def __init__(self, config_path: Path, config: dict | None = None):
+        self.config_path = config_path
+        # Copy so the cached config from load_config() isn't mutated
+        self.config = copy.deepcopy(config if config is not None else load_config())
+        self._edits: list[tuple[str, str, str | None, str, bool]] = []
+        self._needs_dump = False
+        self._messages: list[tuple[str, str | None]] = []
+
+    def __enter__(self) -> ConfigSession:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if exc_type is None:
+            self.save()
+        return False
+
+    def set(
+        self,
+        keys: tuple[str, ...],
+        value,
+        pattern: str | None = None,
+        replacement: str | None = None,
+        section: str | None = None,
+        fallback_to_dump: bool = False,
+    ) -> None:
+        """
+        Set a config value and queue the matching line rewrite.
+
+        Args:
+            keys: Path to the value, e.g. ("engines", "openai-api", "model")
+            value: New value
+            pattern: Line regex for _rewrite_config; None forces a YAML dump
+            replacement: Replacement template for the matched line
+            section: Section header that scopes the rewrite
+            fallback_to_dump: If no line matches (e.g. the value is written
+                in a form the pattern doesn't cover), fall back to a YAML dump
+                instead of failing
+        """
+        node = self.config
+        for key in keys[:-1]:
+            if not isinstance(node.get(key), dict):
+                node[key] = {}
+            node = node[key]
+        had_key = keys[-1] in node and not fallback_to_dump
+        node[keys[-1]] = value
+
+        if pattern is None:
+            self._needs_dump = True
+        else:
+            self._edits.append((pattern, replacement, section, keys[-1], had_key))
+
+    def report(self, message: str, warning: str | None = None) -> None:
+        """Queue a success message (and optional follow-up warning) for after the save."""
+        self._messages.append((message, warning))
+
+    def save(self) -> bool:
+        """Write queued changes to config.yaml. Returns True if the config was written."""
+        if not self._edits and not self._needs_dump:
+            return False
+
+        try:
+            self._write()
+        except Exception as e:
+            print_error(f"Error updating config: {e}", ["Please update config.yaml manually."])
+            return False
+        finally:
+            self._edits.clear()
+            self._needs_dump = False
+
+        for message, warning in self._messages:
+            print_success(message, {"Config": str(self.config_path)})
+            if warning:
+                console.print(f"\n[yellow]{warning}[/yellow]")
+        self._messages.clear()
+        return True
+
+    def _write(self) -> None:
+        needs_dump = self._needs_dump
+
+        def check(changed: list[bool]) -> bool:
+            # Runs before config.yaml is replaced, so a failed edit leaves the
+            # file untouched instead of half-applied
+            nonlocal needs_dump
+            for (_, _, section, key, had_key), was_changed in zip(self._edits, changed):
+                if was_changed:
+                    continue
+                if had_key:
+                    where = f"the {section} '{key}:'" if section else f"the '{key}:'"
+                    raise ValueError(f"could not locate {where} line in config.yaml")
+                # Key is missing entirely - add it via YAML
+                needs_dump = True
+            # The YAML dump below rewrites everything, so skip the line rewrite
+            return not needs_dump
+
+        if self._edits:
+            _rewrite_config_many(
+                self.config_path,
+                [(pattern, replacement, section) for pattern, replacement, section, _, _ in self._edits],
+                check,
+            )
+
+        if needs_dump:
+            import yaml
+
+            tmp_path = Path(f"{self.config_path}.tmp")
+            try:
+                with open(tmp_path, 'w') as f:
+                    yaml.dump(self.config, f, default_flow_style=False, sort_keys=False)
+                if self.config_path.exists():
+                    shutil.copymode(self.config_path, tmp_path)
+                os.replace(tmp_path, self.config_path)
+            except BaseException:
+                tmp_path.unlink(missing_ok=True)
+                raise
+
+
 def run_config_test() -> bool:
     """Run configuration tests. Returns True if all pass."""
+    import requests
+
     console.print()
     console.print("[bold]Testing configuration[/bold]")
 
@@ -86,7 +303,7 @@ def run_config_test() -> bool:
     results.append(("Config file", True, str(config_path)))
 
     # Test all AI engines and mark active one
-    active_engine = config.get("engine", "claude-api")
+    active_engine = get_active_engine(config)
     engine_results = []  # Separate list for engine results
 
     with get_progress_spinner() as progress:
@@ -272,7 +489,7 @@ def show_status():
     config = load_config()
 
     # Active engine panel
-    engine_name = config.get("engine", "claude-api")
+    engine_name = get_active_engine(config)
     engine_table = create_key_value_table()
 
     try:
@@ -458,6 +675,8 @@ def get_engine_config_status(engine_name: str, config: dict) -> tuple[bool, str]
         host = engine_config.get("host", "localhost:11434")
         if not host.startswith("http"):
             host = f"http://{host}"
+        import requests
+
         try:
             response = requests.get(f"{host}/api/tags", timeout=2)
             if response.status_code == 200:
@@ -484,6 +703,11 @@ ENGINE_DEFAULT_MODELS = {
 }
 
 
+def get_active_engine(config: dict) -> str:
+    """Get the active engine name from config."""
+    return config.get("engine") or "claude-api"
+
+
 def get_engine_model(engine_name: str, config: dict) -> str:
     """Get the configured model for an engine, or its default."""
     engine_config = config.get("engines", {}).get(engine_name, {})
@@ -491,21 +715,59 @@ def get_engine_model(engine_name: str, config: dict) -> str:
     if engine_name == "claude-cli":
         # Claude CLI doesn't have a model setting in config
         # It uses whatever model is configured in Claude CLI itself
-        # Check if --model is passed via args
+        # Check if --model is passed via args (either "--model X" or "--model=X")
         args = engine_config.get("args", [])
-        if args and "--model" in args:
-            try:
-                model_idx = args.index("--model")
-                if model_idx + 1 < len(args):
-                    return args[model_idx + 1]
-            except (ValueError, IndexError):
-                pass
+        for i, arg in enumerate(args):
+            if arg == "--model" and i + 1 < len(args):
+                return args[i + 1]
+            if arg.startswith("--model="):
+                return arg.split("=", 1)[1]
         return "(uses CLI default)"
 
     default_model = ENGINE_DEFAULT_MODELS.get(engine_name, "unknown")
     return engine_config.get("model", default_model)
 
 
+# Built-in model choices per engine, used when config.yaml has no available_models list
+_DEFAULT_AVAILABLE_MODELS: dict[str, tuple[str, ...]] = {
+    "claude-api": (
+        "claude-sonnet-4-20250514",
+        "claude-opus-4-20250514",
+        "claude-3-5-sonnet-20241022",
+        "claude-3-5-haiku-20241022",
+    ),
+    "claude-cli": (
+        "opus",
+        "sonnet",
+        "haiku",
+    ),
+    "openai-api": (
+        "gpt-4o",
+        "gpt-4o-mini",
+        "gpt-4-turbo",
+        "o1",
+        "o1-mini",
+    ),
+    "openai-codex-cli": (
+        "gpt-5",
+        "gpt-4o",
+        "o1",
+    ),
+    "gemini-api": (
+        "gemini-2.0-flash",
+        "gemini-2.0-flash-thinking-exp",
+        "gemini-1.5-pro",
+        "gemini-1.5-flash",
+    ),
+    "gemini-cli": (
+        "gemini-2.0-flash",
+        "gemini-2.0-flash-thinking-exp",
+        "gemini-1.5-pro",
+        "gemini-1.5-flash",
+    ),
+}
+
+
 def get_available_models(engine_name: str, config: dict) -> list[str]:
     """
     Get available models for an engine from config.yaml.
@@ -515,56 +777,19 @@ def get_available_models(engine_name: str, config: dict) -> list[str]:
 
     Returns list of model IDs.
     """
-    # Check if user has configured available_models in config.yaml
     engine_config = config.get("engines", {}).get(engine_name, {})
-    user_models = engine_config.get("available_models", [])
-
+    user_models = engine_config.get("available_models")
     if user_models:
-        return user_models
-
-    # Fallback to built-in defaults if not configured
-    default_models = {
-        "claude-api": [
-            "claude-sonnet-4-20250514",
-            "claude-opus-4-20250514",
-            "claude-3-5-sonnet-20241022",
-            "claude-3-5-haiku-20241022",
-        ],
-        "claude-cli": [
-            "opus",
-            "sonnet",
-            "haiku",
-        ],
-        "openai-api": [
-            "gpt-4o",
-            "gpt-4o-mini",
-            "gpt-4-turbo",
-            "o1",
-            "o1-mini",
-        ],
-        "openai-codex-cli": [
-            "gpt-5",
-            "gpt-4o",
-            "o1",
-        ],
-        "gemini-api": [
-            "gemini-2.0-flash",
-            "gemini-2.0-flash-thinking-exp",
-            "gemini-1.5-pro",
-            "gemini-1.5-flash",
-        ],
-        "gemini-cli": [
-            "gemini-2.0-flash",
-            "gemini-2.0-flash-thinking-exp",
-            "gemini-1.5-pro",
-            "gemini-1.5-flash",
-        ],
-    }
-    return default_models.get(engine_name, [])
-
-
-def switch_engine():
-    """Interactive engine switcher."""
+        return list(user_models)
+    return list(_DEFAULT_AVAILABLE_MODELS.get(engine_name, ()))
+
+
+def switch_engine(session: ConfigSession | None = None):
+    """Interactive engine switcher.
+
+    Pass a ConfigSession to batch the change with other switches; otherwise
+    the config is written before returning.
+    """
     console.print()
 
     # Check if config exists
@@ -576,8 +801,11 @@ def switch_engine():
         )
         return
 
-    config = load_config()
-    current_engine = config.get("engine", "claude-api")
+    own_session = session is None
+    if own_session:
+        session = ConfigSession(config_path)
+    config = session.config
+    current_engine = get_active_engine(config)
 
     try:
         from engines import list_engines
@@ -586,14 +814,22 @@ def switch_engine():
         print_error("Could not load engines module", ["Run 'python setup.py' to reinstall."])
         return
 
+    # Status checks may probe PATH or a local server (ollama), so each engine
+    # is checked once and reused when the selection is validated below
+    @lru_cache(maxsize=None)
+    def _status(name: str) -> tuple[bool, str]:
+        return get_engine_config_status(name, config)
+
+    @lru_cache(maxsize=None)
+    def _model(name: str) -> str:
+        return get_engine_model(name, config)
+
     # Build engine status table
-    engine_status = {}
     table = create_status_table(["#", "Engine", "Model", "Status", "Details"])
 
     for i, engine_name in enumerate(available_engines, 1):
-        is_configured, status_msg = get_engine_config_status(engine_name, config)
-        engine_status[engine_name] = is_configured
-        model = get_engine_model(engine_name, config)
+        is_configured, status_msg = _status(engine_name)
+        model = _model(engine_name)
 
         # Format engine name
         if engine_name == current_engine:
@@ -632,6 +868,9 @@ def switch_engine():
                 choice_num = int(choice)
                 if 1 <= choice_num <= len(available_engines):
                     selected_engine = available_engines[choice_num - 1]
+                    if selected_engine == current_engine:
+                        console.print(f"\n{selected_engine} is already the active engine.")
+                        return
                     break
                 else:
                     console.print(f"[yellow]Enter a number between 1 and {len(available_engines)}[/yellow]")
@@ -639,7 +878,7 @@ def switch_engine():
                 console.print("[yellow]Invalid input. Enter a number, 's', 'm', or 'q'.[/yellow]")
 
         # Check if selected engine is configured
-        if not engine_status[selected_engine]:
+        if not _status(selected_engine)[0]:
             print_warning(f"{selected_engine} is not fully configured.")
             if not confirm("Switch anyway?"):
                 console.print(format_dim("No changes made."))
@@ -649,40 +888,22 @@ def switch_engine():
         return
 
     # Update config file
-    if selected_engine == current_engine:
-        console.print(f"\n{selected_engine} is already the active engine.")
-        return
-
-    try:
-        with open(config_path, 'r') as f:
-            config_content = f.read()
-
-        new_content = re.sub(
-            r'^(engine:\s*)["\']?[\w-]+["\']?\s*$',
-            f'engine: "{selected_engine}"',
-            config_content,
-            flags=re.MULTILINE
-        )
-
-        if new_content == config_content:
-            config["engine"] = selected_engine
-            with open(config_path, 'w') as f:
-                yaml.dump(config, f, default_flow_style=False, sort_keys=False)
-        else:
-            with open(config_path, 'w') as f:
-                f.write(new_content)
-
-        print_success(f"Switched to {selected_engine}", {"Config": str(config_path)})
-
-        if not engine_status[selected_engine]:
-            console.print(f"\n[yellow]Remember to configure {selected_engine} in config.yaml[/yellow]")
-
-    except Exception as e:
-        print_error(f"Error updating config: {e}", ["Please update config.yaml manually."])
-
-
-def switch_output():
-    """Interactive output format switcher."""
+    session.set(
+        ("engine",),
+        selected_engine,
+        r'^(engine:\s*)["\']?[\w-]+["\']?\s*$',
+        f'engine: "{selected_engine}"',
+    )
+    session.report(
+        f"Switched to {selected_engine}",
+        None if _status(selected_engine)[0] else f"Remember to configure {selected_engine} in config.yaml",
+    )
+    if own_session:
+        session.save()
+
+
+def switch_output(session: ConfigSession | None = None):
+    """Interactive output format switcher (see switch_engine for session)."""
     console.print()
 
     # Check if config exists
@@ -694,7 +915,10 @@ def switch_output():
         )
         return
 
-    config = load_config()
+    own_session = session is None
+    if own_session:
+        session = ConfigSession(config_path)
+    config = session.config
     current_format = config.get("output", {}).get("format", "html")
 
     available_formats = [
@@ -732,6 +956,9 @@ def switch_output():
                 choice_num = int(choice)
                 if 1 <= choice_num <= len(available_formats):
                     selected_format = available_formats[choice_num - 1][0]
+                    if selected_format == current_format:
+                        console.print(f"\n{selected_format.upper()} is already the active format.")
+                        return
                     break
                 else:
                     console.print(f"[yellow]Enter a number between 1 and {len(available_formats)}[/yellow]")
@@ -742,39 +969,19 @@ def switch_output():
         return
 
     # Update config file
-    if selected_format == current_format:
-        console.print(f"\n{selected_format.upper()} is already the active format.")
-        return
-
-    try:
-        with open(config_path, 'r') as f:
-            config_content = f.read()
-
-        new_content = re.sub(
-            r'^(\s*format:\s*)["\']?[\w]+["\']?\s*$',
-            f'\\1"{selected_format}"',
-            config_content,
-            flags=re.MULTILINE
-        )
-
-        if new_content == config_content:
-            if "output" not in config:
-                config["output"] = {}
-            config["output"]["format"] = selected_format
-            with open(config_path, 'w') as f:
-                yaml.dump(config, f, default_flow_style=False, sort_keys=False)
-        else:
-            with open(config_path, 'w') as f:
-                f.write(new_content)
-
-        print_success(f"Switched to {selected_format.upper()}", {"Config": str(config_path)})
-
-    except Exception as e:
-        print_error(f"Error updating config: {e}", ["Please update config.yaml manually."])
-
-
-def switch_model():
-    """Interactive model switcher for the active engine."""
+    session.set(
+        ("output", "format"),
+        selected_format,
+        r'^(\s*format:\s*)["\']?[\w]+["\']?\s*$',
+        f'\\1"{selected_format}"',
+    )
+    session.report(f"Switched to {selected_format.upper()}")
+    if own_session:
+        session.save()
+
+
+def switch_model(session: ConfigSession | None = None):
+    """Interactive model switcher for the active engine (see switch_engine for session)."""
     console.print()
 
     # Check if config exists
@@ -786,8 +993,11 @@ def switch_model():
         )
         return
 
-    config = load_config()
-    current_engine = config.get("engine", "claude-api")
+    own_session = session is None
+    if own_session:
+        session = ConfigSession(config_path)
+    config = session.config
+    current_engine = get_active_engine(config)
     current_model = get_engine_model(current_engine, config)
 
     # Get available models for this engine from config (or defaults)
@@ -835,6 +1045,9 @@ def switch_model():
                 custom_model = console.input("[cyan]Model: [/cyan]").strip()
                 if custom_model:
                     selected_model = custom_model
+                    if selected_model == current_model:
+                        console.print(f"\n{selected_model} is already the active model.")
+                        return
                     break
                 else:
                     console.print("[yellow]No model entered. Please try again.[/yellow]")
@@ -844,6 +1057,9 @@ def switch_model():
                 choice_num = int(choice)
                 if 1 <= choice_num <= len(available_models):
                     selected_model = available_models[choice_num - 1]
+                    if selected_model == current_model:
+                        console.print(f"\n{selected_model} is already the active model.")
+                        return
                     break
                 else:
                     console.print(f"[yellow]Enter a number between 1 and {len(available_models)}, 'c', or 'q'[/yellow]")
@@ -854,59 +1070,39 @@ def switch_model():
         return
 
     # Update config file
-    if selected_model == current_model:
-        console.print(f"\n{selected_model} is already the active model.")
-        return
-
-    try:
-        # Handle claude-cli specially - it uses args: ["--model", "..."] format
-        if current_engine == "claude-cli":
-            if "engines" not in config:
-                config["engines"] = {}
-            if "claude-cli" not in config["engines"]:
-                config["engines"]["claude-cli"] = {}
-            config["engines"]["claude-cli"]["args"] = ["--model", selected_model]
-            with open(config_path, 'w') as f:
-                yaml.dump(config, f, default_flow_style=False, sort_keys=False)
-        else:
-            # Standard model key update for other engines
-            with open(config_path, 'r') as f:
-                config_content = f.read()
-
-            # Try to update the model in the specific engine section
-            # Pattern: find the engine section and update its model line
-            engine_section_pattern = rf'(^\s*{re.escape(current_engine)}:\s*\n(?:.*\n)*?)(^\s*model:\s*)["\']?[^"\'\n]+["\']?(\s*$)'
-            new_content = re.sub(
-                engine_section_pattern,
-                rf'\g<1>\g<2>"{selected_model}"\3',
-                config_content,
-                flags=re.MULTILINE
-            )
-
-            if new_content == config_content:
-                # Regex didn't match, update via YAML
-                if "engines" not in config:
-                    config["engines"] = {}
-                if current_engine not in config["engines"]:
-                    config["engines"][current_engine] = {}
-                config["engines"][current_engine]["model"] = selected_model
-                with open(config_path, 'w') as f:
-                    yaml.dump(config, f, default_flow_style=False, sort_keys=False)
-            else:
-                with open(config_path, 'w') as f:
-                    f.write(new_content)
-
-        print_success(f"Switched {current_engine} to {selected_model}", {"Config": str(config_path)})
-
-    except Exception as e:
-        print_error(f"Error updating config: {e}", ["Please update config.yaml manually."])
+    if current_engine == "claude-cli":
+        # claude-cli uses args: ["--model", "..."]; a one-line list is rewritten
+        # in place, anything else (e.g. a block-style list) goes through YAML
+        session.set(
+            ("engines", "claude-cli", "args"),
+            ["--model", selected_model],
+            r'^(\s*args:\s*)\[[^\]\n]*\](\s*)$',
+            rf'\g<1>["--model", "{selected_model}"]\2',
+            section="claude-cli",
+            fallback_to_dump=True,
+        )
+    else:
+        # Update the first model line following the engine's section header
+        session.set(
+            ("engines", current_engine, "model"),
+            selected_model,
+            r'^(\s*model:\s*)["\']?[^"\'\n]+["\']?(\s*)$',
+            rf'\g<1>"{selected_model}"\2',
+            section=current_engine,
+        )
+    session.report(f"Switched {current_engine} to {selected_model}")
+    if own_session:
+        session.save()
 
 
 def show_prompt():
     """Display the current review prompt template."""
     prompt_path = get_file_path("prompt.md")
 
-    if not prompt_path.exists():
+    # Read directly; a missing file is the only case that needs a check
+    try:
+        prompt = prompt_path.read_text()
+    except FileNotFoundError:
         from cli_utils import print_cli_error
         print_cli_error(
             f"prompt.md not found at [yellow]{prompt_path}[/yellow]",
@@ -916,7 +1112,7 @@ def show_prompt():
 
     print(f"Prompt file: {prompt_path}\n")
     print("=" * 60)
-    print(prompt_path.read_text())
+    print(prompt)
     print("=" * 60)
     print(f"\nTo edit this prompt, run: wtp --edit-prompt")
 
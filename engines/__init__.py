@@ -16,7 +16,14 @@ Available engines:
 
 from __future__ import annotations
 
-from .base import BaseEngine, EngineError
+from .base import (
+    BaseEngine,
+    EngineError,
+    build_prompt,
+    iter_prompt_chunks,
+    preview_prompt,
+    write_prompt_file,
+)
 from .claude_api import ClaudeAPIEngine
 from .claude_cli import ClaudeCLIEngine
 from .openai_api import OpenAIAPIEngine
@@ -6,8 +6,158 @@ All AI engines must inherit from BaseEngine and implement the required methods.
 
 from __future__ import annotations
 
+import string
 from abc import ABC, abstractmethod
-from typing import Optional
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator, Optional
+
+
+_MISSING = object()
+
+
+def _prompt_fields(pr_data: dict, ticket_id: str, external_context: str) -> dict:
+    """Values substituted into the prompt template's placeholders."""
+    return {
+        "ticket_id": ticket_id,
+        "pr_title": pr_data["title"],
+        "pr_url": pr_data.get("pr_url", ""),
+        "pr_author": pr_data.get("author", "Unknown"),
+        "source_branch": pr_data["source_branch"],
+        "target_branch": pr_data["target_branch"],
+        "pr_description": pr_data["description"],
+        "diff": pr_data["diff"],
+        "external_context": external_context if external_context else "No external context provided.",
+    }
+
+
+def build_prompt(
+    pr_data: dict,
+    ticket_id: str,
+    prompt_template: str,
+    external_context: str = "",
+) -> str:
+    """
+    Build the full prompt from template and PR data.
+
+    Args:
+        pr_data: PR information dictionary
+        ticket_id: Ticket ID
+        prompt_template: Template string with placeholders
+        external_context: Optional external context from local files/directories
+
+    Returns:
+        Formatted prompt string
+    """
+    return prompt_template.format(**_prompt_fields(pr_data, ticket_id, external_context))
+
+
+@lru_cache(maxsize=8)
+def _compile_prompt_template(prompt_template: str) -> tuple[tuple[str, str | None, str, str | None], ...]:
+    """
+    Split a prompt template into (literal, field_name, format_spec, conversion) spans.
+
+    The prompt template is fixed for a run, so it is parsed once rather than
+    on every iter_prompt_chunks call. Literal "{{" / "}}" escapes are already
+    resolved in the returned literals.
+    """
+    return tuple(string.Formatter().parse(prompt_template))
+
+
+def iter_prompt_chunks(
+    pr_data: dict,
+    ticket_id: str,
+    prompt_template: str,
+    external_context: str = "",
+) -> Iterator[str]:
+    """
+    Yield the prompt as template segments and field values, in order.
+
+    Produces the same text as build_prompt, but the diff and external context
+    are yielded as the existing strings rather than copied into one large
+    prompt string, so writers can stream them out.
+    """
+    formatter = None
+    fields = _prompt_fields(pr_data, ticket_id, external_context)
+    for literal, field_name, format_spec, conversion in _compile_prompt_template(prompt_template):
+        if literal:
+            yield literal
+        if field_name is None:
+            continue
+
+        value = fields.get(field_name, _MISSING)
+        if value is not _MISSING and not conversion and not format_spec and isinstance(value, str):
+            # Plain {name} placeholder - the common case
+            yield value
+            continue
+
+        # Attribute/index access, !r/!s/!a conversions and format specs
+        if formatter is None:
+            formatter = string.Formatter()
+        value, _ = formatter.get_field(field_name, (), fields)
+        value = formatter.convert_field(value, conversion)
+        if format_spec:
+            format_spec = formatter.vformat(format_spec, (), fields)
+        yield format(value, format_spec)
+
+
+def preview_prompt(
+    pr_data: dict,
+    ticket_id: str,
+    prompt_template: str,
+    external_context: str = "",
+    limit: int = 3000,
+) -> tuple[str, int, int]:
+    """
+    Summarise the prompt for --verbose/--dry-run without building it.
+
+    Args:
+        pr_data: PR information dictionary
+        ticket_id: Ticket ID
+        prompt_template: Template string with placeholders
+        external_context: Optional external context from local files/directories
+        limit: Maximum number of characters in the preview
+
+    Returns:
+        Tuple of (preview, total_chars, total_bytes). The diff's byte count is
+        taken from pr_data["diff_size"] when the fetcher provided it.
+    """
+    diff = pr_data["diff"]
+    diff_size = pr_data.get("diff_size")
+    parts: list[str] = []
+    preview_len = 0
+    total_chars = 0
+    total_bytes = 0
+    for chunk in iter_prompt_chunks(pr_data, ticket_id, prompt_template, external_context):
+        if preview_len < limit:
+            part = chunk[:limit - preview_len]
+            parts.append(part)
+            preview_len += len(part)
+        total_chars += len(chunk)
+        if chunk is diff and diff_size is not None:
+            total_bytes += diff_size
+        elif chunk.isascii():
+            # One byte per character; skips allocating an encoded copy
+            total_bytes += len(chunk)
+        else:
+            total_bytes += len(chunk.encode("utf-8"))
+    return "".join(parts), total_chars, total_bytes
+
+
+def write_prompt_file(
+    path: Path,
+    pr_data: dict,
+    ticket_id: str,
+    prompt_template: str,
+    external_context: str = "",
+) -> None:
+    """
+    Write the formatted prompt to path for the CLI engines.
+
+    Streams iter_prompt_chunks to the file without materialising the full prompt.
+    """
+    with open(path, "w") as f:
+        f.writelines(iter_prompt_chunks(pr_data, ticket_id, prompt_template, external_context))
 
 
 class EngineError(Exception):
@@ -121,15 +271,4 @@ class BaseEngine(ABC):
         Returns:
             Formatted prompt string
         """
-        context_section = external_context if external_context else "No external context provided."
-        return prompt_template.format(
-            ticket_id=ticket_id,
-            pr_title=pr_data["title"],
-            pr_url=pr_data.get("pr_url", ""),
-            pr_author=pr_data.get("author", "Unknown"),
-            source_branch=pr_data["source_branch"],
-            target_branch=pr_data["target_branch"],
-            pr_description=pr_data["description"],
-            diff=pr_data["diff"],
-            external_context=context_section,
-        )
+        return build_prompt(pr_data, ticket_id, prompt_template, external_context)
@@ -9,8 +9,6 @@ from __future__ import annotations
 
 from typing import Optional
 
-import requests
-
 from .base import BaseEngine, EngineError
 
 
@@ -107,6 +105,8 @@ Your output will be parsed programmatically, so format compliance is essential."
 
     def test_connection(self) -> tuple[bool, Optional[str]]:
         """Test connection to Ollama server."""
+        import requests
+
         model = self.config.get("model", self.DEFAULT_MODEL)
         base_url = self._get_base_url()
 
@@ -215,6 +215,8 @@ Your output will be parsed programmatically, so format compliance is essential."
         if num_ctx:
             payload["options"] = {"num_ctx": num_ctx}
 
+        import requests
+
         try:
             response = requests.post(
                 f"{base_url}/api/chat",
@@ -14,7 +14,7 @@ import tempfile
 from pathlib import Path
 from typing import Optional
 
-from .base import BaseEngine, EngineError
+from .base import BaseEngine, EngineError, write_prompt_file
 
 
 class OpenAICodexCLIEngine(BaseEngine):
@@ -226,8 +226,7 @@ PR Description:
 
             # Write the formatted prompt (with all template variables filled in)
             template_file = temp_dir / "review-template.md"
-            formatted_prompt = self.build_prompt(pr_data, ticket_id, prompt_template, external_context)
-            template_file.write_text(formatted_prompt)
+            write_prompt_file(template_file, pr_data, ticket_id, prompt_template, external_context)
 
             # Build the prompt for Codex CLI
             cli_prompt = (
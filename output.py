@@ -9,12 +9,14 @@ This module handles saving and formatting PR reviews:
 
 from __future__ import annotations
 
+import html
 import os
 import platform
 import re
 import subprocess
 import webbrowser
-from pathlib import Path
+from functools import lru_cache
+from pathlib import Path, PurePath
 
 from cli_utils import (
     console,
@@ -23,6 +25,9 @@ from cli_utils import (
 from pr_providers import sanitize_filename
 
 
+_EXTENSIONS = {"md": ".md", "txt": ".txt", "html": ".html"}
+
+
 def save_review(
     review: str,
     pr_info: dict,
@@ -57,20 +62,28 @@ def save_review(
     )
 
     # Remove existing extension if present and add the correct one
-    base_name = Path(base_filename).stem
-    extension_map = {"md": ".md", "txt": ".txt", "html": ".html"}
-    extension = extension_map.get(output_format.lower(), ".md")
+    output_format = output_format.lower()
+    base_name = PurePath(base_filename).stem
+    extension = _EXTENSIONS.get(output_format, ".md")
     filename = f"{base_name}{extension}"
 
     # Convert content based on format
-    if output_format.lower() == "html":
+    if output_format == "html":
         title = f"PR Review: {ticket_id} - {pr_data['title']}"
-        content = convert_to_html(review, title)
+        content = convert_to_html(review, title, config["output"].get("line_breaks", True))
     else:
         content = review
 
+    # Encode explicitly: the HTML declares UTF-8 whatever the platform default is.
+    # Written in one call to a sibling temp file and swapped in, so an
+    # interrupted save never leaves a truncated report over a previous one.
     output_path = output_dir / filename
-    output_path.write_text(content)
+    tmp_path = output_path.with_name(f"{filename}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_bytes(content.encode("utf-8"))
+        os.replace(tmp_path, output_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
 
     return output_path
 
@@ -223,13 +236,75 @@ strong {
 """
 
 
-def convert_to_html(markdown_content: str, title: str = "PR Review") -> str:
-    """Convert markdown content to styled HTML with GitHub-like styling."""
+# Static parts of the HTML document built by convert_to_html(), around the title and body
+_HTML_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>"""
+_HTML_STYLE = f"""</title>
+    {GITHUB_CSS}
+</head>
+<body>
+"""
+_HTML_TAIL = """
+</body>
+</html>"""
+
+# Severity labels converted to styled badges by convert_to_html(), in a single pass
+# Matches patterns like: <h3>🔴 Critical: Issue Title</h3>, with the emoji as
+# unicode, as a markdown shortcode (AI sometimes outputs these) or left out
+_SEVERITY_PATTERN = re.compile(
+    r'(<h3>)\s*(?:[🔴🟠🟡🟢]|:(?:red|orange|yellow|green)_circle:)?\s*(Critical|High|Medium|Low):',
+    re.IGNORECASE,
+)
+
+
+def _severity_badge(match: re.Match) -> str:
+    """Replacement for _SEVERITY_PATTERN: the <h3> followed by a badge span."""
+    level = match.group(2).capitalize()
+    return f'{match.group(1)}<span class="severity-badge severity-{level.lower()}">{level}</span>'
+
+
+# Plain URLs not already inside href="" or wrapped in <a> tags
+_URL_PATTERN = re.compile(r'(?<!href=["\'])(?<!</a>)(https?://[^\s<>"\']+)')
+
+
+@lru_cache(maxsize=2)
+def _get_markdown(line_breaks: bool):
+    """
+    Build the Markdown converter once per line_breaks setting.
+
+    Registering the extensions costs more than converting a typical review;
+    callers reset() the instance before each use. Raises ImportError if the
+    markdown package is missing.
+    """
+    import markdown
+    from markdown.extensions.codehilite import CodeHiliteExtension
+    from markdown.extensions.fenced_code import FencedCodeExtension
+    from markdown.extensions.tables import TableExtension
+
+    # Code blocks are only highlighted when fenced with a language; guessing
+    # tries every Pygments lexer per block and often picks the wrong one
+    extensions = [
+        FencedCodeExtension(),
+        CodeHiliteExtension(css_class="highlight", guess_lang=False),
+        TableExtension(),
+    ]
+    if line_breaks:
+        extensions.append("nl2br")
+    return markdown.Markdown(extensions=extensions)
+
+
+def convert_to_html(markdown_content: str, title: str = "PR Review", line_breaks: bool = True) -> str:
+    """Convert markdown content to styled HTML with GitHub-like styling.
+
+    With line_breaks, every newline becomes a <br> (as in GitHub comments);
+    without it, only blank lines separate paragraphs (as in README rendering).
+    """
     try:
-        import markdown
-        from markdown.extensions.codehilite import CodeHiliteExtension
-        from markdown.extensions.fenced_code import FencedCodeExtension
-        from markdown.extensions.tables import TableExtension
+        md = _get_markdown(line_breaks)
     except ImportError:
         print("Warning: markdown package not installed. Install with: pip install markdown pygments")
         # Fallback: wrap in basic HTML
@@ -237,84 +312,43 @@ def convert_to_html(markdown_content: str, title: str = "PR Review") -> str:
 <html>
 <head>
     <meta charset="UTF-8">
-    <title>{title}</title>
+    <title>{html.escape(title)}</title>
 </head>
 <body>
-<pre>{markdown_content}</pre>
+<pre>{html.escape(markdown_content)}</pre>
 </body>
 </html>"""
 
     # Convert markdown to HTML with extensions
-    md = markdown.Markdown(
-        extensions=[
-            FencedCodeExtension(),
-            CodeHiliteExtension(css_class="highlight", guess_lang=True),
-            TableExtension(),
-            "nl2br",
-        ]
-    )
-    html_body = md.convert(markdown_content)
+    html_body = md.reset().convert(markdown_content)
 
     # Post-process: Convert severity labels to styled badges
-    # Matches patterns like: <h3>🔴 Critical: Issue Title</h3>
-    severity_patterns = [
-        # Unicode emoji format
-        (r'(<h3>)\s*🔴\s*Critical:', r'\1<span class="severity-badge severity-critical">Critical</span>'),
-        (r'(<h3>)\s*🟠\s*High:', r'\1<span class="severity-badge severity-high">High</span>'),
-        (r'(<h3>)\s*🟡\s*Medium:', r'\1<span class="severity-badge severity-medium">Medium</span>'),
-        (r'(<h3>)\s*🟢\s*Low:', r'\1<span class="severity-badge severity-low">Low</span>'),
-        # Markdown emoji shortcode format (AI sometimes outputs these)
-        (r'(<h3>)\s*:red_circle:\s*Critical:', r'\1<span class="severity-badge severity-critical">Critical</span>'),
-        (r'(<h3>)\s*:orange_circle:\s*High:', r'\1<span class="severity-badge severity-high">High</span>'),
-        (r'(<h3>)\s*:yellow_circle:\s*Medium:', r'\1<span class="severity-badge severity-medium">Medium</span>'),
-        (r'(<h3>)\s*:green_circle:\s*Low:', r'\1<span class="severity-badge severity-low">Low</span>'),
-        # Fallback without emoji
-        (r'(<h3>)\s*Critical:', r'\1<span class="severity-badge severity-critical">Critical</span>'),
-        (r'(<h3>)\s*High:', r'\1<span class="severity-badge severity-high">High</span>'),
-        (r'(<h3>)\s*Medium:', r'\1<span class="severity-badge severity-medium">Medium</span>'),
-        (r'(<h3>)\s*Low:', r'\1<span class="severity-badge severity-low">Low</span>'),
-    ]
-    for pattern, replacement in severity_patterns:
-        html_body = re.sub(pattern, replacement, html_body, flags=re.IGNORECASE)
+    html_body = _SEVERITY_PATTERN.sub(_severity_badge, html_body)
 
     # Post-process: Convert plain URLs to clickable links
-    # Matches URLs not already inside href="" or wrapped in <a> tags
-    url_pattern = r'(?<!href=["\'])(?<!</a>)(https?://[^\s<>"\']+)'
-    html_body = re.sub(url_pattern, r'<a href="\1">\1</a>', html_body)
+    html_body = _URL_PATTERN.sub(r'<a href="\1">\1</a>', html_body)
 
     # Wrap in full HTML document with styling
-    return f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title}</title>
-    {GITHUB_CSS}
-</head>
-<body>
-{html_body}
-</body>
-</html>"""
+    return f"{_HTML_HEAD}{html.escape(title)}{_HTML_STYLE}{html_body}{_HTML_TAIL}"
 
 
 def auto_open_file(file_path: Path) -> bool:
     """Open file in the default application. Returns True if successful."""
     try:
-        file_url = file_path.as_uri()
-
         # For HTML files, use webbrowser module
         if file_path.suffix.lower() == ".html":
-            webbrowser.open(file_url)
+            webbrowser.open(file_path.as_uri())
             return True
 
         # For other files, use platform-specific commands
+        path_str = os.fspath(file_path)
         system = platform.system()
         if system == "Darwin":  # macOS
-            subprocess.run(["open", str(file_path)], check=True)
+            subprocess.run(["open", path_str], check=True)
         elif system == "Windows":
-            os.startfile(str(file_path))
+            os.startfile(path_str)
         else:  # Linux and others
-            subprocess.run(["xdg-open", str(file_path)], check=True)
+            subprocess.run(["xdg-open", path_str], check=True)
         return True
     except Exception as e:
         print(f"Could not open file automatically: {e}")
@@ -7,11 +7,116 @@ Includes URL parsing, API calls, and diff retrieval.
 
 from __future__ import annotations
 
+import json
+import os
 import re
 import sys
+import time
+from functools import lru_cache
+from pathlib import Path
 from urllib.parse import urlparse
 
-import requests
+# orjson parses straight from bytes and is noticeably faster on large PR
+# payloads (file lists can run to thousands of entries); optional
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _parse_json(response) -> dict | list:
+    """Parse a JSON API response body, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return json.loads(response.content)
+
+
+# PR cache: the last fetched PR per (platform, owner, repo, number), revalidated
+# with the metadata response's ETag/Last-Modified so unchanged PRs skip the diff download
+PR_CACHE_DIR = Path.home() / ".whatthepatch" / "pr_cache"
+PR_CACHE_VERSION = 1
+PR_CACHE_MAX_AGE = 7 * 24 * 3600  # Entries unused for a week are dropped
+PR_CACHE_MAX_ENTRIES = 50  # Least recently used entries beyond this are dropped
+
+
+def _pr_cache_path(platform: str, owner: str, repo: str, pr_number: str) -> Path:
+    """Get the cache file path for a PR."""
+    name = f"{sanitize_filename(owner)}_{sanitize_filename(repo)}_{sanitize_filename(pr_number)}.json"
+    return PR_CACHE_DIR / platform / name
+
+
+def _load_pr_cache(cache_path: Path) -> dict | None:
+    """Load a cached PR entry, or None if missing, expired, unreadable or from another cache version."""
+    try:
+        if time.time() - cache_path.stat().st_mtime > PR_CACHE_MAX_AGE:
+            cache_path.unlink()
+            return None
+        with open(cache_path, "rb") as f:
+            entry = json.loads(f.read())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(entry, dict) or entry.get("version") != PR_CACHE_VERSION or "pr" not in entry:
+        return None
+    try:
+        os.utime(cache_path)  # Mark as recently used for eviction
+    except OSError:
+        pass
+    return entry
+
+
+def _prune_pr_cache() -> None:
+    """Drop PR cache entries past PR_CACHE_MAX_AGE, then all but the PR_CACHE_MAX_ENTRIES most recently used."""
+    entries = []
+    for path in PR_CACHE_DIR.glob("*/*.json"):
+        try:
+            entries.append((path.stat().st_mtime, path))
+        except OSError:
+            continue
+    entries.sort(reverse=True)
+
+    cutoff = time.time() - PR_CACHE_MAX_AGE
+    for index, (mtime, path) in enumerate(entries):
+        if index >= PR_CACHE_MAX_ENTRIES or mtime < cutoff:
+            path.unlink(missing_ok=True)
+
+
+def _save_pr_cache(cache_path: Path, response, pr: dict) -> None:
+    """Cache a fetched PR along with the validators from its metadata response."""
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if not etag and not last_modified:
+        return  # Nothing to revalidate against next time
+
+    entry = {
+        "version": PR_CACHE_VERSION,
+        "etag": etag,
+        "last_modified": last_modified,
+        "pr": pr,
+    }
+    # Per-process temp name so concurrent runs on the same PR can't interleave writes
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        cache_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        # Diffs may come from private repos, so keep the files owner-only
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with open(fd, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, cache_path)
+        _prune_pr_cache()
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+
+
+def _pr_cache_headers(entry: dict | None) -> dict:
+    """Conditional request headers for a cached PR entry."""
+    if not entry:
+        return {}
+    headers = {}
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
 
 
 def parse_pr_url(url: str) -> dict:
@@ -58,6 +163,7 @@ def fetch_github_pr_files(owner: str, repo: str, pr_number: str, token: str) ->
     Returns:
         Tuple of (reconstructed_diff, file_count, truncated_count)
     """
+    import requests
     from cli_utils import print_warning
 
     headers = {
@@ -86,7 +192,7 @@ def fetch_github_pr_files(owner: str, repo: str, pr_number: str, token: str) ->
             )
             sys.exit(1)
 
-        files = response.json()
+        files = _parse_json(response)
         if not files:
             break
 
@@ -144,8 +250,15 @@ def fetch_github_pr_files(owner: str, repo: str, pr_number: str, token: str) ->
     return "\n".join(diff_parts), len(all_files), truncated_count
 
 
-def fetch_github_pr(owner: str, repo: str, pr_number: str, token: str) -> dict:
-    """Fetch PR details and diff from GitHub API."""
+def fetch_github_pr(owner: str, repo: str, pr_number: str, token: str, use_cache: bool = True) -> dict:
+    """Fetch PR details and diff from GitHub API.
+
+    The returned dict includes diff_size, the diff's size in bytes as
+    received, so callers don't need to re-encode the diff to measure it.
+    With use_cache=False any cached copy is ignored (the fresh result is
+    still cached).
+    """
+    import requests
     from cli_utils import print_warning
 
     headers = {
@@ -153,16 +266,22 @@ def fetch_github_pr(owner: str, repo: str, pr_number: str, token: str) -> dict:
         "Accept": "application/vnd.github.v3+json",
     }
 
-    # Fetch PR metadata
+    # Fetch PR metadata, revalidating any cached copy of this PR
+    cache_path = _pr_cache_path("github", owner, repo, pr_number)
+    cached = _load_pr_cache(cache_path) if use_cache else None
     pr_url = f"https://api.github.com/repos/{owner}/{repo}/pulls/{pr_number}"
-    response = requests.get(pr_url, headers=headers)
+    response = requests.get(pr_url, headers={**headers, **_pr_cache_headers(cached)})
+
+    if response.status_code == 304 and cached:
+        # Metadata unchanged (includes the head commit), so the diff is too
+        return cached["pr"]
 
     if response.status_code != 200:
         print(f"Error fetching PR from GitHub: {response.status_code}")
         print(response.text)
         sys.exit(1)
 
-    pr_data = response.json()
+    pr_data = _parse_json(response)
 
     # Try to fetch diff directly first
     headers["Accept"] = "application/vnd.github.v3.diff"
@@ -170,6 +289,7 @@ def fetch_github_pr(owner: str, repo: str, pr_number: str, token: str) -> dict:
 
     if diff_response.status_code == 200:
         diff = diff_response.text
+        diff_size = len(diff_response.content)
     elif diff_response.status_code == 406:
         # Diff too large - fall back to files API
         print_warning(
@@ -177,6 +297,8 @@ def fetch_github_pr(owner: str, repo: str, pr_number: str, token: str) -> dict:
             f"Fetching via files API (supports up to 3000 files)..."
         )
         diff, file_count, truncated_count = fetch_github_pr_files(owner, repo, pr_number, token)
+        # Assembled locally, so measure it; ASCII needs no encoded copy
+        diff_size = len(diff) if diff.isascii() else len(diff.encode("utf-8"))
 
         if truncated_count > 0:
             print_warning(
@@ -189,32 +311,43 @@ def fetch_github_pr(owner: str, repo: str, pr_number: str, token: str) -> dict:
         print(f"Error fetching diff from GitHub: {diff_response.status_code}")
         sys.exit(1)
 
-    return {
+    result = {
         "title": pr_data["title"],
         "description": pr_data.get("body") or "(No description provided)",
         "source_branch": pr_data["head"]["ref"],
         "target_branch": pr_data["base"]["ref"],
         "diff": diff,
+        "diff_size": diff_size,
         "author": pr_data["user"]["login"],
     }
+    _save_pr_cache(cache_path, response, result)
+    return result
 
 
 def fetch_bitbucket_pr(
-    workspace: str, repo: str, pr_number: str, username: str, app_password: str
+    workspace: str, repo: str, pr_number: str, username: str, app_password: str,
+    use_cache: bool = True,
 ) -> dict:
-    """Fetch PR details and diff from Bitbucket API."""
+    """Fetch PR details and diff from Bitbucket API (see fetch_github_pr for diff_size and use_cache)."""
+    import requests
+
     auth = (username, app_password)
 
-    # Fetch PR metadata
+    # Fetch PR metadata, revalidating any cached copy of this PR
+    cache_path = _pr_cache_path("bitbucket", workspace, repo, pr_number)
+    cached = _load_pr_cache(cache_path) if use_cache else None
     pr_url = f"https://api.bitbucket.org/2.0/repositories/{workspace}/{repo}/pullrequests/{pr_number}"
-    response = requests.get(pr_url, auth=auth)
+    response = requests.get(pr_url, auth=auth, headers=_pr_cache_headers(cached))
+
+    if response.status_code == 304 and cached:
+        return cached["pr"]
 
     if response.status_code != 200:
         print(f"Error fetching PR from Bitbucket: {response.status_code}")
         print(response.text)
         sys.exit(1)
 
-    pr_data = response.json()
+    pr_data = _parse_json(response)
 
     # Fetch diff
     diff_url = f"{pr_url}/diff"
@@ -224,24 +357,38 @@ def fetch_bitbucket_pr(
         print(f"Error fetching diff from Bitbucket: {diff_response.status_code}")
         sys.exit(1)
 
-    return {
+    result = {
         "title": pr_data["title"],
         "description": pr_data.get("description") or "(No description provided)",
         "source_branch": pr_data["source"]["branch"]["name"],
         "target_branch": pr_data["destination"]["branch"]["name"],
         "diff": diff_response.text,
+        "diff_size": len(diff_response.content),
         "author": pr_data["author"]["display_name"],
     }
+    _save_pr_cache(cache_path, response, result)
+    return result
+
+
+@lru_cache(maxsize=16)
+def _compile_ticket_pattern(pattern: str) -> re.Pattern:
+    """Compile a ticket pattern from config, once per distinct pattern string."""
+    return re.compile(pattern)
 
 
-def extract_ticket_id(branch_name: str, pattern: str, fallback: str) -> str:
-    """Extract ticket ID from branch name using regex pattern."""
-    match = re.search(pattern, branch_name)
+def extract_ticket_id(branch_name: str, pattern: str | re.Pattern, fallback: str) -> str:
+    """Extract ticket ID from branch name using regex pattern (string or compiled)."""
+    if isinstance(pattern, str):
+        pattern = _compile_ticket_pattern(pattern)
+    match = pattern.search(branch_name)
     if match:
         return match.group(1)
     return fallback
 
 
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^\w\-_]")
+
+
 def sanitize_filename(name: str) -> str:
     """Sanitize a string for use in filenames."""
-    return re.sub(r"[^\w\-_]", "-", name)
+    return _UNSAFE_FILENAME_CHARS.sub("-", name)
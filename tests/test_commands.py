@@ -0,0 +1,210 @@
+"""
+Tests for config-editing helpers in commands.py.
+
+Tests cover:
+- _rewrite_config() - streaming line rewrite used by the switch_* commands
+- ConfigSession - batching several switch changes into one write, leaving
+  config.yaml untouched when an edit fails
+- switch_model() - claude-cli model switches keep config.yaml comments
+"""
+
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+import yaml
+
+from commands import ConfigSession, _rewrite_config, switch_model
+
+
+SAMPLE_CONFIG = """\
+# Active engine
+engine: "claude-api"
+
+engines:
+  claude-api:
+    api_key: "sk-ant-api03-real"
+    model: "claude-sonnet-4-20250514"
+  openai-api:
+    model: "gpt-4o"
+
+output:
+  format: "html"
+"""
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    """A config.yaml with comments and several engine sections."""
+    path = tmp_path / "config.yaml"
+    path.write_text(SAMPLE_CONFIG)
+    return path
+
+
+class TestRewriteConfig:
+    """Tests for _rewrite_config() function."""
+
+    def test_rewrites_top_level_key(self, config_file):
+        """Should replace the matching line and keep comments intact."""
+        changed = _rewrite_config(
+            config_file,
+            r'^(engine:\s*)["\']?[\w-]+["\']?\s*$',
+            'engine: "openai-api"',
+        )
+        assert changed is True
+        content = config_file.read_text()
+        assert 'engine: "openai-api"' in content
+        assert "# Active engine" in content
+
+    def test_section_limits_rewrite(self, config_file):
+        """Should only rewrite the model line inside the given section."""
+        changed = _rewrite_config(
+            config_file,
+            r'^(\s*model:\s*)["\']?[^"\'\n]+["\']?(\s*)$',
+            r'\g<1>"gpt-4o-mini"\2',
+            section="openai-api",
+        )
+        assert changed is True
+        content = config_file.read_text()
+        assert 'model: "claude-sonnet-4-20250514"' in content
+        assert 'model: "gpt-4o-mini"' in content
+
+    def test_returns_false_when_nothing_matches(self, config_file):
+        """Should leave the file untouched and clean up the temp file."""
+        changed = _rewrite_config(config_file, r'^missing:.*$', "missing: 1")
+        assert changed is False
+        assert config_file.read_text() == SAMPLE_CONFIG
+        assert not (config_file.parent / "config.yaml.tmp").exists()
+
+
+class TestConfigSession:
+    """Tests for ConfigSession batching of switch changes."""
+
+    def test_batches_edits_into_one_write(self, config_file):
+        """Should apply several edits in one rewrite and keep comments."""
+        session = ConfigSession(config_file, yaml.safe_load(SAMPLE_CONFIG))
+        session.set(("engine",), "openai-api", r'^(engine:\s*)["\']?[\w-]+["\']?\s*$', 'engine: "openai-api"')
+        session.set(
+            ("engines", "openai-api", "model"),
+            "gpt-4o-mini",
+            r'^(\s*model:\s*)["\']?[^"\'\n]+["\']?(\s*)$',
+            r'\g<1>"gpt-4o-mini"\2',
+            section="openai-api",
+        )
+
+        with patch("commands.os.replace", wraps=os.replace) as mock_replace:
+            assert session.save() is True
+
+        assert mock_replace.call_count == 1
+        content = config_file.read_text()
+        assert 'engine: "openai-api"' in content
+        assert 'model: "gpt-4o-mini"' in content
+        assert "# Active engine" in content
+
+    def test_later_switch_sees_earlier_change(self, config_file):
+        """The in-memory config should reflect queued changes immediately."""
+        session = ConfigSession(config_file, yaml.safe_load(SAMPLE_CONFIG))
+        session.set(("engine",), "openai-api", r'^(engine:\s*)["\']?[\w-]+["\']?\s*$', 'engine: "openai-api"')
+        assert session.config["engine"] == "openai-api"
+
+    def test_missing_key_falls_back_to_yaml_dump(self, config_file):
+        """Should dump the whole config when a key has no line to rewrite."""
+        session = ConfigSession(config_file, yaml.safe_load(SAMPLE_CONFIG))
+        session.set(
+            ("engines", "ollama", "model"),
+            "codellama",
+            r'^(\s*model:\s*)["\']?[^"\'\n]+["\']?(\s*)$',
+            r'\g<1>"codellama"\2',
+            section="ollama",
+        )
+        assert session.save() is True
+        assert yaml.safe_load(config_file.read_text())["engines"]["ollama"]["model"] == "codellama"
+
+    def test_does_not_mutate_passed_config(self, config_file):
+        """Changes should not leak into the (cached) config it was given."""
+        config = yaml.safe_load(SAMPLE_CONFIG)
+        session = ConfigSession(config_file, config)
+        session.set(("output", "format"), "md", r'^(\s*format:\s*)["\']?[\w]+["\']?\s*$', '\\1"md"')
+        assert config["output"]["format"] == "html"
+
+    def test_failed_edit_leaves_file_untouched(self, config_file):
+        """A missing line should abort the save before any edit is written."""
+        session = ConfigSession(config_file, yaml.safe_load(SAMPLE_CONFIG))
+        session.set(("engine",), "openai-api", r'^(engine:\s*)["\']?[\w-]+["\']?\s*$', 'engine: "openai-api"')
+        session.set(
+            ("engines", "openai-api", "model"),
+            "gpt-4o-mini",
+            r'^(\s*nomatch:\s*).*$',
+            r'\g<1>"gpt-4o-mini"',
+            section="openai-api",
+        )
+        session.report("Engine switched")
+
+        with patch("commands.print_success") as mock_success, patch("commands.print_error"):
+            assert session.save() is False
+
+        assert config_file.read_text() == SAMPLE_CONFIG
+        assert not (config_file.parent / "config.yaml.tmp").exists()
+        mock_success.assert_not_called()
+
+    def test_yaml_dump_replaces_atomically(self, config_file):
+        """The YAML dump fallback should go through a temp file and one replace."""
+        session = ConfigSession(config_file, yaml.safe_load(SAMPLE_CONFIG))
+        session.set(("engine",), "openai-api", r'^(engine:\s*)["\']?[\w-]+["\']?\s*$', 'engine: "openai-api"')
+        session.set(
+            ("engines", "ollama", "model"),
+            "codellama",
+            r'^(\s*model:\s*)["\']?[^"\'\n]+["\']?(\s*)$',
+            r'\g<1>"codellama"\2',
+            section="ollama",
+        )
+
+        with patch("commands.os.replace", wraps=os.replace) as mock_replace:
+            assert session.save() is True
+
+        assert mock_replace.call_count == 1
+        saved = yaml.safe_load(config_file.read_text())
+        assert saved["engine"] == "openai-api"
+        assert saved["engines"]["ollama"]["model"] == "codellama"
+        assert not (config_file.parent / "config.yaml.tmp").exists()
+
+
+class TestSwitchModelClaudeCli:
+    """Tests for switching the claude-cli model, which lives in its args list."""
+
+    @pytest.fixture
+    def example_config(self, tmp_path):
+        """A copy of config.example.yaml with claude-cli as the active engine."""
+        example = Path(__file__).parent.parent / "config.example.yaml"
+        path = tmp_path / "config.yaml"
+        path.write_text(example.read_text().replace('engine: "claude-api"', 'engine: "claude-cli"', 1))
+        return path
+
+    def _switch(self, config_path, choice):
+        session = ConfigSession(config_path, yaml.safe_load(config_path.read_text()))
+        with patch("commands.get_file_path", return_value=config_path), \
+                patch("commands.console.input", return_value=choice), \
+                patch("commands.print_success"):
+            switch_model(session)
+            assert session.save() is True
+
+    def test_rewrites_args_line_and_keeps_comments(self, example_config):
+        """Should rewrite the args line in place rather than dumping the YAML."""
+        original = example_config.read_text()
+        self._switch(example_config, "2")  # sonnet
+
+        content = example_config.read_text()
+        assert 'args: ["--model", "sonnet"]' in content
+        assert "# Additional arguments to pass to claude command" in content
+        assert content.count("\n") == original.count("\n")
+        assert yaml.safe_load(content)["engines"]["claude-cli"]["args"] == ["--model", "sonnet"]
+
+    def test_block_style_args_fall_back_to_yaml_dump(self, example_config):
+        """Should still switch when args is written as a block-style list."""
+        example_config.write_text(
+            example_config.read_text().replace("    args: []\n", "    args:\n      - --verbose\n", 1)
+        )
+        self._switch(example_config, "1")  # opus
+
+        assert yaml.safe_load(example_config.read_text())["engines"]["claude-cli"]["args"] == ["--model", "opus"]
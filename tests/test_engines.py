@@ -5,6 +5,7 @@ Tests cover:
 - get_engine_config_status() - checking if engines are configured
 - Engine registry and factory functions
 - API key validation (placeholder detection)
+- Prompt building (build_prompt / iter_prompt_chunks)
 """
 
 import pytest
@@ -241,3 +242,53 @@ class TestEngineBaseClass:
         assert hasattr(ClaudeAPIEngine, "DEFAULT_MODEL")
         assert hasattr(OpenAIAPIEngine, "DEFAULT_MODEL")
         assert hasattr(GeminiAPIEngine, "DEFAULT_MODEL")
+
+
+class TestPromptChunks:
+    """Tests for iter_prompt_chunks(), preview_prompt() and write_prompt_file()."""
+
+    PR_DATA = {
+        "title": "Fix login",
+        "pr_url": "https://github.com/owner/repo/pull/1",
+        "author": "dev",
+        "source_branch": "feature/ABC-1-login",
+        "target_branch": "main",
+        "description": "Fixes {braces} in description",
+        "diff": "diff --git a/x b/x\n+{not a placeholder}\n",
+    }
+    TEMPLATE = (
+        "Ticket {ticket_id}: {pr_title!r} by {pr_author:>6}\n"
+        "Literal {{braces}}\n{pr_description}\n{diff}\n{external_context}"
+    )
+
+    def test_chunks_match_build_prompt(self):
+        """Joined chunks should equal the str.format result."""
+        from engines import build_prompt, iter_prompt_chunks
+
+        expected = build_prompt(self.PR_DATA, "ABC-1", self.TEMPLATE)
+        assert "".join(iter_prompt_chunks(self.PR_DATA, "ABC-1", self.TEMPLATE)) == expected
+
+    def test_diff_is_yielded_without_copying(self):
+        """The diff should be yielded as the original string object."""
+        from engines import iter_prompt_chunks
+
+        chunks = list(iter_prompt_chunks(self.PR_DATA, "ABC-1", self.TEMPLATE))
+        assert any(chunk is self.PR_DATA["diff"] for chunk in chunks)
+
+    def test_write_prompt_file_streams_template(self, tmp_path):
+        """Should write the same text build_prompt produces."""
+        from engines import build_prompt, write_prompt_file
+
+        path = tmp_path / "review-template.md"
+        write_prompt_file(path, self.PR_DATA, "ABC-1", self.TEMPLATE, "ctx")
+        assert path.read_text() == build_prompt(self.PR_DATA, "ABC-1", self.TEMPLATE, "ctx")
+
+    def test_preview_prompt_matches_full_prompt(self):
+        """Preview and totals should agree with the fully built prompt."""
+        from engines import build_prompt, preview_prompt
+
+        full = build_prompt(self.PR_DATA, "ABC-1", self.TEMPLATE)
+        preview, chars, size = preview_prompt(self.PR_DATA, "ABC-1", self.TEMPLATE, limit=40)
+        assert preview == full[:40]
+        assert chars == len(full)
+        assert size == len(full.encode("utf-8"))
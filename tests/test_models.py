@@ -90,6 +90,18 @@ class TestGetEngineModel:
         result = get_engine_model("claude-cli", mock_config_full)
         assert result == "(uses CLI default)"
 
+    def test_claude_cli_returns_model_from_equals_arg(self, mock_config_full):
+        """Should extract model from --model=value form for Claude CLI."""
+        mock_config_full["engines"]["claude-cli"]["args"] = ["--verbose", "--model=sonnet"]
+        result = get_engine_model("claude-cli", mock_config_full)
+        assert result == "sonnet"
+
+    def test_claude_cli_trailing_model_flag_uses_default(self, mock_config_full):
+        """Should return placeholder when --model has no value."""
+        mock_config_full["engines"]["claude-cli"]["args"] = ["--model"]
+        result = get_engine_model("claude-cli", mock_config_full)
+        assert result == "(uses CLI default)"
+
     def test_unknown_engine_returns_unknown(self, mock_config_full):
         """Should return 'unknown' for unrecognized engine names."""
         result = get_engine_model("nonexistent-engine", mock_config_full)
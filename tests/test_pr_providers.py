@@ -0,0 +1,144 @@
+"""
+Tests for PR fetching helpers in pr_providers.py.
+
+Tests cover:
+- PR cache - ETag revalidation of previously fetched PRs, expiry and eviction
+"""
+
+import os
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import pr_providers
+from pr_providers import fetch_github_pr
+
+
+def _response(status_code, json_body=b"", text="", headers=None):
+    """Build a fake requests.Response."""
+    response = MagicMock()
+    response.status_code = status_code
+    response.content = json_body or text.encode("utf-8")
+    response.text = text
+    response.headers = headers or {}
+    return response
+
+
+PR_JSON = (
+    b'{"title": "Fix login", "body": "Details", "head": {"ref": "feature/ABC-1"},'
+    b' "base": {"ref": "main"}, "user": {"login": "dev"}}'
+)
+DIFF = "diff --git a/x b/x\n+line\n"
+
+
+@pytest.fixture
+def pr_cache_dir(tmp_path, monkeypatch):
+    """Point the PR cache at a temporary directory."""
+    monkeypatch.setattr(pr_providers, "PR_CACHE_DIR", tmp_path / "pr_cache")
+    return tmp_path / "pr_cache"
+
+
+class TestPrCache:
+    """Tests for the ETag-revalidated PR cache."""
+
+    def test_second_fetch_uses_cache_on_304(self, pr_cache_dir):
+        """Should send If-None-Match and reuse the cached PR on 304."""
+        first = [
+            _response(200, PR_JSON, headers={"ETag": '"abc"'}),
+            _response(200, text=DIFF),
+        ]
+        with patch("requests.get", side_effect=first):
+            pr = fetch_github_pr("owner", "repo", "1", "token")
+
+        with patch("requests.get", return_value=_response(304)) as mock_get:
+            cached = fetch_github_pr("owner", "repo", "1", "token")
+
+        assert cached == pr
+        assert cached["diff"] == DIFF
+        assert mock_get.call_count == 1
+        assert mock_get.call_args.kwargs["headers"]["If-None-Match"] == '"abc"'
+
+    def test_no_cache_without_validators(self, pr_cache_dir):
+        """Should not cache responses that carry no ETag or Last-Modified."""
+        responses = [_response(200, PR_JSON), _response(200, text=DIFF)]
+        with patch("requests.get", side_effect=responses):
+            fetch_github_pr("owner", "repo", "1", "token")
+
+        assert not pr_cache_dir.exists() or not any(pr_cache_dir.rglob("*.json"))
+
+    def test_corrupt_cache_is_ignored(self, pr_cache_dir):
+        """Should fall back to a normal fetch when the cache file is unreadable."""
+        cache_path = pr_providers._pr_cache_path("github", "owner", "repo", "1")
+        cache_path.parent.mkdir(parents=True)
+        cache_path.write_text("{not json")
+
+        responses = [_response(200, PR_JSON), _response(200, text=DIFF)]
+        with patch("requests.get", side_effect=responses) as mock_get:
+            pr = fetch_github_pr("owner", "repo", "1", "token")
+
+        assert pr["title"] == "Fix login"
+        assert "If-None-Match" not in mock_get.call_args_list[0].kwargs["headers"]
+
+    def test_use_cache_false_skips_revalidation(self, pr_cache_dir):
+        """Should ignore the cached PR (no validators sent) but refresh the cache."""
+        first = [
+            _response(200, PR_JSON, headers={"ETag": '"abc"'}),
+            _response(200, text=DIFF),
+        ]
+        with patch("requests.get", side_effect=first):
+            fetch_github_pr("owner", "repo", "1", "token")
+
+        second = [
+            _response(200, PR_JSON, headers={"ETag": '"def"'}),
+            _response(200, text=DIFF),
+        ]
+        with patch("requests.get", side_effect=second) as mock_get:
+            fetch_github_pr("owner", "repo", "1", "token", use_cache=False)
+
+        assert "If-None-Match" not in mock_get.call_args_list[0].kwargs["headers"]
+        cache_path = pr_providers._pr_cache_path("github", "owner", "repo", "1")
+        assert pr_providers._load_pr_cache(cache_path)["etag"] == '"def"'
+
+    def test_cache_file_is_private(self, pr_cache_dir):
+        """Cached diffs may hold private code, so files should be owner-only."""
+        responses = [_response(200, PR_JSON, headers={"ETag": '"abc"'}), _response(200, text=DIFF)]
+        with patch("requests.get", side_effect=responses):
+            fetch_github_pr("owner", "repo", "1", "token")
+
+        cache_path = pr_providers._pr_cache_path("github", "owner", "repo", "1")
+        assert cache_path.stat().st_mode & 0o777 == 0o600
+
+    def test_expired_entry_is_ignored(self, pr_cache_dir):
+        """Entries older than PR_CACHE_MAX_AGE should be dropped, not revalidated."""
+        responses = [_response(200, PR_JSON, headers={"ETag": '"abc"'}), _response(200, text=DIFF)]
+        with patch("requests.get", side_effect=responses):
+            fetch_github_pr("owner", "repo", "1", "token")
+
+        cache_path = pr_providers._pr_cache_path("github", "owner", "repo", "1")
+        old = time.time() - pr_providers.PR_CACHE_MAX_AGE - 60
+        os.utime(cache_path, (old, old))
+
+        assert pr_providers._load_pr_cache(cache_path) is None
+        assert not cache_path.exists()
+
+    def test_least_recently_used_entries_are_evicted(self, pr_cache_dir, monkeypatch):
+        """Saving beyond PR_CACHE_MAX_ENTRIES should drop the least recently used PRs."""
+        now = time.time()
+        for number in ("1", "2", "3"):
+            responses = [_response(200, PR_JSON, headers={"ETag": '"abc"'}), _response(200, text=DIFF)]
+            with patch("requests.get", side_effect=responses):
+                fetch_github_pr("owner", "repo", number, "token")
+            # Spread the mtimes out so recency doesn't depend on timer resolution
+            path = pr_providers._pr_cache_path("github", "owner", "repo", number)
+            os.utime(path, (now - 100 + int(number), now - 100 + int(number)))
+
+        monkeypatch.setattr(pr_providers, "PR_CACHE_MAX_ENTRIES", 3)
+        # Using PR 1 makes PR 2 the least recently used
+        assert pr_providers._load_pr_cache(pr_providers._pr_cache_path("github", "owner", "repo", "1"))
+        responses = [_response(200, PR_JSON, headers={"ETag": '"abc"'}), _response(200, text=DIFF)]
+        with patch("requests.get", side_effect=responses):
+            fetch_github_pr("owner", "repo", "4", "token")
+
+        remaining = sorted(path.stem for path in pr_cache_dir.rglob("*.json"))
+        assert remaining == ["owner_repo_1", "owner_repo_3", "owner_repo_4"]
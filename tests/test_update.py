@@ -0,0 +1,404 @@
+"""
+Tests for the self-update helpers in update.py.
+
+Tests cover:
+- _update_via_download() - ETag revalidation, 404s and failed writes
+- _update_via_download() - skipping files that match the manifest hash
+- _install_requirements() - skipping pip for an already installed requirements.txt
+- _requirements_satisfied() - the in-process installed-packages check
+- start_update_check() / check_for_updates() - the background release check
+- _install_requirements() - the pip timeout and the output tail
+"""
+
+import hashlib
+import io
+import json
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import update
+
+
+def _response(status_code, content=b"", headers=None):
+    """Build a fake requests.Response."""
+    response = MagicMock()
+    response.status_code = status_code
+    response.content = content
+    response.headers = headers or {}
+    return response
+
+
+def _session(files, manifest=None):
+    """
+    Build a fake requests.Session serving manifest.json and the given files.
+
+    files maps a filename to a response, or to a callable taking the request
+    headers and returning one.
+    """
+    def get(url, headers=None, timeout=None):
+        filename = url[len(update.GITHUB_RAW_BASE) + 1:]
+        if filename == "manifest.json":
+            if manifest is None:
+                return _response(404)
+            return _response(200, json.dumps(manifest).encode())
+        response = files.get(filename, _response(404))
+        if isinstance(response, MagicMock):
+            return response
+        return response(headers or {})
+
+    session = MagicMock()
+    session.get.side_effect = get
+    return session
+
+
+def _run_download(target_dir, session):
+    """Run _update_via_download against a fake session, quietly."""
+    with patch.object(update, "_create_download_session", return_value=session), \
+            patch.object(update, "console"), \
+            patch.object(update, "print_success"), \
+            patch.object(update, "print_error"):
+        return update._update_via_download(target_dir)
+
+
+def _requested(session):
+    """Filenames the fake session was asked for, excluding the manifest."""
+    return [
+        call.args[0][len(update.GITHUB_RAW_BASE) + 1:]
+        for call in session.get.call_args_list
+        if not call.args[0].endswith("/manifest.json")
+    ]
+
+
+class _FakePip:
+    """Stand-in for the pip subprocess: prints the given lines, then exits."""
+
+    def __init__(self, lines=(), returncode=0):
+        self.stdout = io.StringIO("".join(f"{line}\n" for line in lines))
+        self.returncode = returncode
+        self.killed = False
+
+    def wait(self):
+        return self.returncode
+
+    def kill(self):
+        self.killed = True
+
+
+class _HangingPip:
+    """Stand-in for a pip subprocess that prints some lines, then hangs until killed."""
+
+    def __init__(self, lines):
+        self.lines = lines
+        self.killed = threading.Event()
+        self.stdout = self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __iter__(self):
+        for line in self.lines:
+            yield f"{line}\n"
+        self.killed.wait(5)
+
+    def wait(self):
+        return -9 if self.killed.is_set() else 0
+
+    def kill(self):
+        self.killed.set()
+
+
+@pytest.fixture
+def requirements(tmp_path, monkeypatch):
+    """A requirements.txt plus a temporary hash file, with pip output silenced."""
+    monkeypatch.setattr(update, "REQUIREMENTS_HASH_FILE", tmp_path / ".requirements.hash")
+    monkeypatch.setattr(update, "console", MagicMock())
+    monkeypatch.setattr(update, "print_warning", MagicMock())
+    path = tmp_path / "requirements.txt"
+    path.write_text("requests>=2.0\n")
+    return path
+
+
+@pytest.fixture
+def target_dir(tmp_path):
+    """An install directory holding an old copy of update.py."""
+    (tmp_path / "update.py").write_bytes(b"old\n")
+    return tmp_path
+
+
+class TestDownloadValidators:
+    """Tests for ETag handling in the download-based update."""
+
+    def test_etag_saved_after_200(self, target_dir):
+        """Should write the file and record its ETag and hash."""
+        session = _session(
+            {"update.py": _response(200, b"new\n", {"ETag": '"v2"'})},
+            manifest={"files": ["update.py"]},
+        )
+
+        assert _run_download(target_dir, session) is True
+
+        assert (target_dir / "update.py").read_bytes() == b"new\n"
+        entry = update._load_etag_cache(target_dir)["update.py"]
+        assert entry["etag"] == '"v2"'
+        assert entry["sha256"] == hashlib.sha256(b"new\n").hexdigest()
+
+    def test_304_counts_as_unchanged(self, target_dir):
+        """Should send the stored ETag and leave the file alone on 304."""
+        update._save_etag_cache(target_dir, {
+            "update.py": {"etag": '"v1"', "last_modified": None, "sha256": hashlib.sha256(b"old\n").hexdigest()},
+        })
+        seen_headers = []
+
+        def not_modified(headers):
+            seen_headers.append(headers)
+            return _response(304)
+
+        session = _session({"update.py": not_modified}, manifest={"files": ["update.py"]})
+
+        assert _run_download(target_dir, session) is True
+
+        assert seen_headers == [{"If-None-Match": '"v1"'}]
+        assert (target_dir / "update.py").read_bytes() == b"old\n"
+        assert update._load_etag_cache(target_dir)["update.py"]["etag"] == '"v1"'
+
+    def test_locally_edited_file_is_refetched(self, target_dir):
+        """Should not send validators when the file no longer matches its recorded hash."""
+        update._save_etag_cache(target_dir, {
+            "update.py": {"etag": '"v1"', "last_modified": None, "sha256": "0" * 64},
+        })
+        seen_headers = []
+
+        def fresh(headers):
+            seen_headers.append(headers)
+            return _response(200, b"new\n")
+
+        _run_download(target_dir, _session({"update.py": fresh}, manifest={"files": ["update.py"]}))
+
+        assert seen_headers == [{}]
+        assert (target_dir / "update.py").read_bytes() == b"new\n"
+
+    def test_404_counts_as_skipped(self, target_dir):
+        """A file missing upstream should be skipped, not failed."""
+        session = _session(
+            {"update.py": _response(200, b"new\n")},
+            manifest={"files": ["update.py", "optional.md"]},
+        )
+
+        with patch.object(update, "console") as mock_console, \
+                patch.object(update, "_create_download_session", return_value=session), \
+                patch.object(update, "print_success"), \
+                patch.object(update, "print_error") as mock_error:
+            assert update._update_via_download(target_dir) is True
+
+        printed = " ".join(str(call.args[0]) for call in mock_console.print.call_args_list if call.args)
+        assert "Skipped:[/yellow] 1 files" in printed
+        mock_error.assert_not_called()
+        assert not (target_dir / "optional.md").exists()
+
+    def test_failed_write_keeps_original_file(self, target_dir):
+        """A write that fails should report the file and leave the old copy in place."""
+        session = _session({"update.py": _response(200, b"new\n")}, manifest={"files": ["update.py"]})
+
+        with patch.object(update.os, "replace", side_effect=OSError("disk full")):
+            assert _run_download(target_dir, session) is False
+
+        assert (target_dir / "update.py").read_bytes() == b"old\n"
+        assert list(target_dir.glob("*.tmp")) == []
+        assert "update.py" not in update._load_etag_cache(target_dir)
+
+
+class TestManifestHashes:
+    """Tests for skipping downloads of files that already match the manifest."""
+
+    def test_matching_hash_is_not_requested(self, target_dir):
+        """A local file whose sha256 matches the manifest needs no request."""
+        manifest = {"files": [{"path": "update.py", "sha256": hashlib.sha256(b"old\n").hexdigest()}]}
+        session = _session({}, manifest=manifest)
+
+        assert _run_download(target_dir, session) is True
+
+        assert _requested(session) == []
+        assert (target_dir / "update.py").read_bytes() == b"old\n"
+
+    def test_mismatched_hash_is_downloaded(self, target_dir):
+        """A local file whose sha256 differs from the manifest should be fetched."""
+        manifest = {"files": [{"path": "update.py", "sha256": hashlib.sha256(b"new\n").hexdigest()}]}
+        session = _session({"update.py": _response(200, b"new\n")}, manifest=manifest)
+
+        assert _run_download(target_dir, session) is True
+
+        assert _requested(session) == ["update.py"]
+        assert (target_dir / "update.py").read_bytes() == b"new\n"
+
+
+class TestRequirementsHash:
+    """Tests for skipping pip when requirements.txt was already installed."""
+
+    def test_hash_written_after_successful_install(self, requirements):
+        """A successful pip run should record the requirements hash."""
+        with patch.object(update, "_requirements_satisfied", return_value=False), \
+                patch("subprocess.Popen", return_value=_FakePip()) as mock_popen:
+            assert update._install_requirements(requirements) is True
+
+        mock_popen.assert_called_once()
+        assert update.REQUIREMENTS_HASH_FILE.read_text() == update._requirements_hash(requirements)
+
+    def test_failed_install_writes_no_hash(self, requirements):
+        """A failing pip run should leave no hash, so the next update retries."""
+        with patch.object(update, "_requirements_satisfied", return_value=False), \
+                patch("subprocess.Popen", return_value=_FakePip(["ERROR: boom"], returncode=1)):
+            assert update._install_requirements(requirements) is False
+
+        assert not update.REQUIREMENTS_HASH_FILE.exists()
+
+    def test_unchanged_requirements_skip_pip(self, requirements):
+        """Should not run pip or the in-process check when the hash matches."""
+        update.REQUIREMENTS_HASH_FILE.write_text(update._requirements_hash(requirements))
+
+        with patch.object(update, "_requirements_satisfied") as mock_satisfied, \
+                patch("subprocess.Popen") as mock_popen:
+            assert update._install_requirements(requirements) is True
+
+        mock_satisfied.assert_not_called()
+        mock_popen.assert_not_called()
+
+    def test_different_interpreter_forces_reinstall(self, requirements, monkeypatch):
+        """A hash recorded for another Python should not skip pip."""
+        update.REQUIREMENTS_HASH_FILE.write_text(update._requirements_hash(requirements))
+        monkeypatch.setattr(update.sys, "executable", "/opt/other/bin/python3")
+
+        with patch.object(update, "_requirements_satisfied", return_value=False), \
+                patch("subprocess.Popen", return_value=_FakePip()) as mock_popen:
+            assert update._install_requirements(requirements) is True
+
+        assert mock_popen.call_args.args[0][0] == "/opt/other/bin/python3"
+        assert update.REQUIREMENTS_HASH_FILE.read_text() == update._requirements_hash(requirements)
+
+
+class TestRequirementsSatisfied:
+    """Tests for _requirements_satisfied() function."""
+
+    @pytest.fixture
+    def write(self, tmp_path):
+        """Write a requirements.txt with the given lines and return its path."""
+        pytest.importorskip("packaging")
+
+        def write(*lines):
+            path = tmp_path / "requirements.txt"
+            path.write_text("\n".join(lines) + "\n")
+            return path
+        return write
+
+    def test_installed_requirements_are_satisfied(self, write):
+        """Installed packages within their specifiers need no pip run."""
+        path = write("# test deps", "pytest>=1.0  # runner", "", "pyyaml")
+        assert update._requirements_satisfied(path) is True
+
+    def test_missing_package(self, write):
+        """A package that isn't installed should send the caller to pip."""
+        assert update._requirements_satisfied(write("pytest", "wtp-no-such-package-xyz")) is False
+
+    def test_version_mismatch(self, write):
+        """An installed version outside the specifier should send the caller to pip."""
+        assert update._requirements_satisfied(write("pytest<1.0")) is False
+
+    def test_unmet_marker_is_ignored(self, write):
+        """Requirements for another platform should not force pip."""
+        assert update._requirements_satisfied(write('wtp-no-such-package-xyz; python_version < "3"')) is True
+
+    def test_unparsable_line_falls_back_to_pip(self, write):
+        """A line packaging can't parse should not be guessed at."""
+        assert update._requirements_satisfied(write("pytest", "this is not a requirement!")) is False
+
+    def test_pip_options_fall_back_to_pip(self, write):
+        """Options such as -r need pip itself."""
+        assert update._requirements_satisfied(write("-r other.txt")) is False
+
+
+class TestBackgroundUpdateCheck:
+    """Tests for the background release check."""
+
+    @pytest.fixture(autouse=True)
+    def update_cache(self, tmp_path, monkeypatch):
+        """Use a temporary update cache and no leftover check thread."""
+        monkeypatch.setattr(update, "UPDATE_CACHE_FILE", tmp_path / "update_cache.json")
+        monkeypatch.setattr(update, "_update_check_thread", None)
+
+    def test_last_attempt_blocks_a_second_check(self, monkeypatch):
+        """An unfinished check should not be restarted within the retry interval."""
+        release = threading.Event()
+        with patch.object(update, "_refresh_update_cache", side_effect=lambda cache: release.wait(5)) as mock_refresh:
+            update.start_update_check()
+            first = update._update_check_thread
+            assert first is not None
+            assert update.get_update_cache()["last_attempt"] > 0
+
+            # A later run: the earlier thread was abandoned at exit
+            monkeypatch.setattr(update, "_update_check_thread", None)
+            update.start_update_check()
+            release.set()
+            first.join(5)
+
+        assert update._update_check_thread is None
+        assert mock_refresh.call_count == 1
+
+    def test_retries_after_interval(self, monkeypatch):
+        """A check attempted longer ago than the retry interval should run again."""
+        update.save_update_cache({"last_attempt": time.time() - update.UPDATE_CHECK_RETRY_INTERVAL - 60})
+        with patch.object(update, "_refresh_update_cache") as mock_refresh:
+            update.start_update_check()
+            update._update_check_thread.join(5)
+
+        mock_refresh.assert_called_once()
+
+    def test_check_for_updates_does_not_wait_past_timeout(self):
+        """A slow check should fall back to the cached result after `wait` seconds."""
+        update.save_update_cache({"last_check": 0, "latest_version": "99.0.0"})
+        release = threading.Event()
+        with patch.object(update, "_refresh_update_cache", side_effect=lambda cache: release.wait(5)):
+            started = time.monotonic()
+            result = update.check_for_updates(wait=0.1)
+            elapsed = time.monotonic() - started
+            release.set()
+            update._update_check_thread.join(5)
+
+        assert elapsed < 1.0
+        assert result == (True, update._get_version(), "99.0.0")
+
+    def test_fresh_cache_starts_no_check(self):
+        """A cache checked within the interval should be used without a request."""
+        update.save_update_cache({"last_check": time.time(), "latest_version": update._get_version()})
+        with patch.object(update, "_refresh_update_cache") as mock_refresh:
+            result = update.check_for_updates()
+
+        mock_refresh.assert_not_called()
+        assert result[0] is False
+
+
+class TestPipTimeout:
+    """Tests for the watchdog around the pip subprocess."""
+
+    def test_hanging_pip_is_killed_and_tail_reported(self, requirements, monkeypatch):
+        """pip should be killed after the timeout, with only the last lines shown."""
+        monkeypatch.setattr(update, "PIP_INSTALL_TIMEOUT", 0.2)
+        pip = _HangingPip([f"Collecting package-{i}" for i in range(25)])
+
+        with patch.object(update, "_requirements_satisfied", return_value=False), \
+                patch("subprocess.Popen", return_value=pip):
+            started = time.monotonic()
+            assert update._install_requirements(requirements) is False
+
+        assert pip.killed.is_set()
+        assert time.monotonic() - started < 5
+        assert "timed out" in update.print_warning.call_args.args[0]
+        printed = "\n".join(str(call.args[0]) for call in update.console.print.call_args_list if call.args)
+        assert "Collecting package-24" in printed
+        assert "Collecting package-5" in printed
+        assert "Collecting package-4\n" not in printed
+        assert not update.REQUIREMENTS_HASH_FILE.exists()
@@ -0,0 +1,84 @@
+"""
+Tests for context helpers in url_context.py.
+
+Tests cover:
+- read_text_file() - reading local context files
+- fetch_url_content() - URL cache use with and without use_cache
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import url_context
+from url_context import fetch_url_content, read_text_file
+
+
+URL = "https://example.com/guide.txt"
+
+
+def _response(text):
+    """Build a fake requests.Response for a plain-text document."""
+    response = MagicMock()
+    response.status_code = 200
+    response.text = text
+    response.headers = {"content-type": "text/plain"}
+    return response
+
+
+@pytest.fixture
+def url_cache_dir(tmp_path, monkeypatch):
+    """Point the URL cache at a temporary directory."""
+    monkeypatch.setattr(url_context, "URL_CACHE_DIR", tmp_path / "url_cache")
+    return tmp_path / "url_cache"
+
+
+class TestReadTextFile:
+    """Tests for read_text_file() function."""
+
+    def test_normalises_crlf_line_endings(self, tmp_path):
+        """Should translate CRLF like read_text and report the on-disk size."""
+        path = tmp_path / "notes.md"
+        path.write_bytes(b"line one\r\nline two\r\n")
+
+        content, size = read_text_file(path)
+
+        assert content == "line one\nline two\n"
+        assert size == 20
+
+    def test_replaces_undecodable_bytes(self, tmp_path):
+        """Should not raise on bytes the encoding can't decode."""
+        path = tmp_path / "data.txt"
+        path.write_bytes(b"ok \xff\xfe\n")
+
+        content, size = read_text_file(path)
+
+        assert content.startswith("ok ")
+        assert size == 6
+
+
+class TestFetchUrlContent:
+    """Tests for URL cache handling in fetch_url_content()."""
+
+    def test_cached_copy_is_reused(self, url_cache_dir):
+        """A second fetch should be served from the cache."""
+        session = MagicMock()
+        session.get.return_value = _response("first")
+        with patch.object(url_context, "_get_session", return_value=session):
+            fetch_url_content(URL)
+            content, _, _ = fetch_url_content(URL)
+
+        assert content == "first"
+        assert session.get.call_count == 1
+
+    def test_use_cache_false_refetches_and_refreshes_cache(self, url_cache_dir):
+        """Should skip the cached copy but store the fresh one for later runs."""
+        session = MagicMock()
+        session.get.side_effect = [_response("first"), _response("second")]
+        with patch.object(url_context, "_get_session", return_value=session):
+            fetch_url_content(URL)
+            content, _, _ = fetch_url_content(URL, use_cache=False)
+
+        assert content == "second"
+        assert session.get.call_count == 2
+        assert url_context.get_cached_content(URL)[0] == "second"
@@ -9,15 +9,19 @@ This module handles self-update functionality:
 
 from __future__ import annotations
 
+import collections
+import hashlib
 import json
+import os
+import re
 import shutil
 import subprocess
 import sys
+import threading
 import time
+from functools import lru_cache
 from pathlib import Path
 
-import requests
-
 from cli_utils import (
     console,
     print_error,
@@ -28,6 +32,20 @@ from cli_utils import (
     create_key_value_table,
 )
 
+# orjson parses straight from bytes and is faster than the stdlib; optional
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _loads(data: bytes) -> dict:
+    """Parse JSON bytes (a cache file or response body), using orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 # Import version from whatthepatch
 def _get_version() -> str:
     """Get version - imports from whatthepatch to avoid circular import."""
@@ -38,105 +56,122 @@ def _get_version() -> str:
 # Install directory for all WhatThePatch files
 INSTALL_DIR = Path.home() / ".whatthepatch"
 
+# Where this module actually lives (symlinks resolved once at import)
+_SCRIPT_PATH = Path(__file__).resolve()
+_SCRIPT_DIR = _SCRIPT_PATH.parent
+_IS_INSTALLED = _SCRIPT_DIR == INSTALL_DIR
+
+# Where get_file_path() looks: install directory first, then the script
+# directory (for development)
+_SEARCH_ROOTS = (INSTALL_DIR, Path(__file__).parent)
+
+
+# Files get_file_path() has already found (filename -> path); misses aren't
+# cached, since setup or --edit-config may create the file later in the run
+_found_paths: dict[str, Path] = {}
+
 
 def get_file_path(filename: str) -> Path:
     """Get the path to a file, checking install dir first, then script dir."""
-    # Check install directory first
-    install_path = INSTALL_DIR / filename
-    if install_path.exists():
-        return install_path
+    found = _found_paths.get(filename)
+    if found is not None:
+        return found
 
-    # Fall back to script directory (for development)
-    script_path = Path(__file__).parent / filename
-    if script_path.exists():
-        return script_path
+    for root in _SEARCH_ROOTS:
+        path = root / filename
+        if path.exists():
+            _found_paths[filename] = path
+            return path
 
-    return install_path  # Return install path for error messages
+    return INSTALL_DIR / filename  # Return install path for error messages
 
 
 # Update check configuration
 GITHUB_REPO = "aaronmedina-dev/WhatThePatch"
 UPDATE_CHECK_INTERVAL = 86400  # 24 hours in seconds
 UPDATE_CACHE_FILE = Path.home() / ".config" / "whatthepatch" / "update_cache.json"
+UPDATE_CHECK_WAIT = 1.0  # seconds show_update_notification waits for a background check
+UPDATE_CHECK_RETRY_INTERVAL = 3600  # 1 hour between attempts that didn't complete
+
+# Background refresh started by start_update_check(), if any
+_update_check_thread: threading.Thread | None = None
 
 
 def get_update_cache() -> dict:
     """Load the update cache from disk."""
     try:
-        if UPDATE_CACHE_FILE.exists():
-            with open(UPDATE_CACHE_FILE, 'r') as f:
-                return json.load(f)
+        with open(UPDATE_CACHE_FILE, 'rb') as f:
+            return _loads(f.read())
     except (json.JSONDecodeError, IOError):
         pass
     return {}
 
 
+def _write_atomic(path: Path, text: str) -> None:
+    """
+    Write text to path via a per-process temp file and rename.
+
+    Readers (including other wtp processes) see either the old or the new
+    content, never a half-written file. Raises OSError on failure.
+    """
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_text(text)
+        os.replace(tmp_path, path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
 def save_update_cache(cache: dict) -> None:
     """Save the update cache to disk."""
     try:
         UPDATE_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
-        with open(UPDATE_CACHE_FILE, 'w') as f:
-            json.dump(cache, f)
+        _write_atomic(UPDATE_CACHE_FILE, json.dumps(cache))
     except IOError:
         pass  # Silently fail if we can't write cache
 
 
+# Dotted numeric version with optional 'v' prefix, e.g. "v1.3.3"
+_VERSION_PATTERN = re.compile(r'v*(\d+(?:\.\d+)*)')
+
+
+@lru_cache(maxsize=32)
 def parse_version(version_str: str) -> tuple:
     """Parse version string into comparable tuple. Handles 'v' prefix."""
-    version_str = version_str.lstrip('v')
-    try:
-        parts = version_str.split('.')
-        return tuple(int(p) for p in parts)
-    except (ValueError, AttributeError):
+    match = _VERSION_PATTERN.fullmatch(version_str)
+    if not match:
         return (0, 0, 0)
+    return tuple(map(int, match.group(1).split('.')))
 
 
-def check_for_updates() -> tuple[bool, str, str] | None:
-    """
-    Check if a new version is available.
+def _refresh_update_cache(cache: dict) -> None:
+    """Fetch the latest release from GitHub and record it in the update cache."""
+    import requests
 
-    Returns:
-        Tuple of (update_available, current_version, latest_version) or None if check skipped/failed.
-    """
-    cache = get_update_cache()
     current_time = time.time()
+    headers = {"Accept": "application/vnd.github.v3+json"}
+    if cache.get("releases_etag") and cache.get("latest_version"):
+        # A 304 reply doesn't count against the unauthenticated rate limit
+        headers["If-None-Match"] = cache["releases_etag"]
 
-    # Check if we should skip (checked recently)
-    last_check = cache.get("last_check", 0)
-    if current_time - last_check < UPDATE_CHECK_INTERVAL:
-        # Use cached result if available
-        cached_latest = cache.get("latest_version")
-        if cached_latest:
-            current = parse_version(_get_version())
-            latest = parse_version(cached_latest)
-            if latest > current:
-                return (True, _get_version(), cached_latest)
-        return None
-
-    # Fetch latest release from GitHub
     try:
         response = requests.get(
             f"https://api.github.com/repos/{GITHUB_REPO}/releases/latest",
             timeout=5,
-            headers={"Accept": "application/vnd.github.v3+json"}
+            headers=headers
         )
 
         if response.status_code == 200:
-            data = response.json()
-            latest_version = data.get("tag_name", "").lstrip('v')
-
-            # Update cache
             cache["last_check"] = current_time
-            cache["latest_version"] = latest_version
+            cache["latest_version"] = _loads(response.content).get("tag_name", "").lstrip('v')
+            cache["releases_etag"] = response.headers.get("ETag")
             save_update_cache(cache)
 
-            # Compare versions
-            current = parse_version(_get_version())
-            latest = parse_version(latest_version)
-
-            if latest > current:
-                return (True, _get_version(), latest_version)
-            return (False, _get_version(), latest_version)
+        elif response.status_code == 304:
+            # Latest release unchanged since the last check
+            cache["last_check"] = current_time
+            save_update_cache(cache)
 
         elif response.status_code == 404:
             # No releases yet - update cache to avoid repeated checks
@@ -147,7 +182,58 @@ def check_for_updates() -> tuple[bool, str, str] | None:
     except (requests.RequestException, json.JSONDecodeError):
         pass  # Silently fail on network errors
 
-    return None
+
+def start_update_check() -> None:
+    """
+    Refresh the update cache on a background thread if it is stale.
+
+    Called early so the GitHub request overlaps with the command's own work;
+    the thread is a daemon, so a slow network never delays exit. The attempt
+    is recorded before the thread starts, so a check cut short by a quick
+    command (or failing offline) is retried after UPDATE_CHECK_RETRY_INTERVAL
+    rather than on every run.
+    """
+    global _update_check_thread
+    if _update_check_thread is not None:
+        return
+
+    cache = get_update_cache()
+    now = time.time()
+    if now - cache.get("last_check", 0) < UPDATE_CHECK_INTERVAL:
+        return
+    if now - cache.get("last_attempt", 0) < UPDATE_CHECK_RETRY_INTERVAL:
+        return
+
+    cache["last_attempt"] = now
+    save_update_cache(cache)
+
+    _update_check_thread = threading.Thread(
+        target=_refresh_update_cache, args=(cache,), name="wtp-update-check", daemon=True
+    )
+    _update_check_thread.start()
+
+
+def check_for_updates(wait: float = UPDATE_CHECK_WAIT) -> tuple[bool, str, str] | None:
+    """
+    Check if a new version is available.
+
+    Uses the update cache, refreshing it in the background when stale and
+    waiting at most `wait` seconds for that refresh; if it hasn't finished,
+    the last cached result is used.
+
+    Returns:
+        Tuple of (update_available, current_version, latest_version) or None if no release is known.
+    """
+    start_update_check()
+    if _update_check_thread is not None:
+        _update_check_thread.join(wait)
+
+    latest_version = get_update_cache().get("latest_version")
+    if not latest_version:
+        return None
+
+    current_version = _get_version()
+    return (parse_version(latest_version) > parse_version(current_version), current_version, latest_version)
 
 
 def show_update_notification() -> None:
@@ -162,6 +248,19 @@ def show_update_notification() -> None:
 GITHUB_REPO = "aaronmedina-dev/WhatThePatch"
 GITHUB_RAW_BASE = f"https://raw.githubusercontent.com/{GITHUB_REPO}/main"
 
+# Concurrent downloads during --update (kept low to stay clear of GitHub abuse limits)
+DOWNLOAD_WORKERS = 8
+
+# Per-file ETag/Last-Modified validators, stored alongside the updated files
+ETAG_CACHE_FILENAME = ".update_etags.json"
+
+# Hash of the last requirements.txt installed successfully by --update
+REQUIREMENTS_HASH_FILE = INSTALL_DIR / ".requirements.hash"
+
+# pip install run by --update when requirements changed
+PIP_INSTALL_TIMEOUT = 120  # seconds
+PIP_OUTPUT_TAIL_LINES = 20  # pip output lines kept to show on failure
+
 # Files that can be updated from GitHub (legacy fallback if manifest.json not available)
 UPDATABLE_FILES = [
     "whatthepatch.py",
@@ -193,8 +292,26 @@ UPDATABLE_FILES = [
 ]
 
 
+@lru_cache(maxsize=8)
 def _get_git_root(path: Path) -> Path | None:
-    """Get the root directory of the git repository containing path."""
+    """Get the root directory of the git repository containing path.
+
+    Asks git directly (one process regardless of depth, and handles worktrees
+    where .git is a file); the tree is only walked for .git when git itself
+    can't be run. Expects a resolved path so the cache key is stable.
+    """
+    try:
+        result = subprocess.run(
+            ["git", "-C", str(path), "rev-parse", "--show-toplevel"],
+            capture_output=True,
+            text=True,
+            timeout=2
+        )
+        # git's answer is authoritative, including "not a repository"
+        return Path(result.stdout.strip()) if result.returncode == 0 else None
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        pass
+
     current = path
     while current != current.parent:
         if (current / ".git").exists():
@@ -203,10 +320,69 @@ def _get_git_root(path: Path) -> Path | None:
     return None
 
 
+def _requirements_hash(requirements_path: Path) -> str:
+    """Hash requirements.txt together with the interpreter it is installed into."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(requirements_path.read_bytes())
+    digest.update(sys.executable.encode())
+    return digest.hexdigest()
+
+
+def _save_requirements_hash(requirements_hash: str) -> None:
+    """Record the hash of a requirements.txt known to be installed."""
+    try:
+        REQUIREMENTS_HASH_FILE.parent.mkdir(parents=True, exist_ok=True)
+        REQUIREMENTS_HASH_FILE.write_text(requirements_hash)
+    except IOError:
+        pass  # Next update just checks again
+
+
+def _requirements_satisfied(requirements_path: Path) -> bool:
+    """
+    Check in-process whether every requirement is already installed.
+
+    Returns False whenever satisfaction can't be confirmed (packaging not
+    available, unparseable lines, missing or mismatched packages), so the
+    caller falls back to running pip.
+    """
+    try:
+        from importlib import metadata
+        from packaging.requirements import InvalidRequirement, Requirement
+    except ImportError:
+        return False
+
+    for line in requirements_path.read_text().splitlines():
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        if line.startswith("-"):
+            return False  # Options and nested files (-r, -e, --index-url) need pip
+
+        try:
+            req = Requirement(line)
+        except InvalidRequirement:
+            return False
+
+        if req.marker is not None and not req.marker.evaluate():
+            continue
+
+        try:
+            installed_version = metadata.version(req.name)
+        except metadata.PackageNotFoundError:
+            return False
+
+        if not req.specifier.contains(installed_version, prereleases=True):
+            return False
+
+    return True
+
+
 def _install_requirements(requirements_path: Path) -> bool:
     """Install requirements from requirements.txt. Returns True on success."""
     import subprocess
 
+    from rich.markup import escape
+
     if not requirements_path.exists():
         console.print(f"[dim]No requirements.txt found at {requirements_path}[/dim]")
         return True  # Not an error if file doesn't exist
@@ -214,20 +390,34 @@ def _install_requirements(requirements_path: Path) -> bool:
     console.print()
     console.print("[bold]Checking dependencies...[/bold]")
 
+    # Skip pip entirely if this exact file was already installed successfully
+    current_hash = _requirements_hash(requirements_path)
+    try:
+        if REQUIREMENTS_HASH_FILE.read_text().strip() == current_hash:
+            console.print("[green]Dependencies already up to date[/green] [dim](requirements.txt unchanged)[/dim]")
+            return True
+    except IOError:
+        pass
+
+    if _requirements_satisfied(requirements_path):
+        _save_requirements_hash(current_hash)
+        console.print("[green]Dependencies already up to date[/green]")
+        return True
+
+    # Stream pip's output into the spinner as it runs; only the tail is kept
+    # for the failure message
+    output_tail = collections.deque(maxlen=PIP_OUTPUT_TAIL_LINES)
     with get_progress_spinner() as progress:
-        progress.add_task("Installing requirements...", total=None)
+        task = progress.add_task("Installing requirements...", total=None)
         try:
             # Use pip to install requirements
-            result = subprocess.run(
-                [sys.executable, "-m", "pip", "install", "-r", str(requirements_path), "-q"],
-                capture_output=True,
+            proc = subprocess.Popen(
+                [sys.executable, "-m", "pip", "install", "-r", str(requirements_path),
+                 "--disable-pip-version-check"],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
                 text=True,
-                timeout=120
             )
-        except subprocess.TimeoutExpired:
-            print_warning("pip install timed out - you may need to run manually:")
-            console.print(f"  [cyan]pip install -r {requirements_path}[/cyan]")
-            return False
         except FileNotFoundError:
             print_warning("pip not found - install dependencies manually:")
             console.print(f"  [cyan]pip install -r {requirements_path}[/cyan]")
@@ -236,17 +426,42 @@ def _install_requirements(requirements_path: Path) -> bool:
             print_warning(f"Failed to install requirements: {e}")
             return False
 
-    if result.returncode == 0:
+        # Kill pip if it runs past the timeout; reading its output blocks until it exits
+        timed_out = threading.Event()
+
+        def _kill_pip() -> None:
+            timed_out.set()
+            proc.kill()
+
+        watchdog = threading.Timer(PIP_INSTALL_TIMEOUT, _kill_pip)
+        watchdog.start()
+        try:
+            with proc.stdout:
+                for line in proc.stdout:
+                    line = line.strip()
+                    if line:
+                        output_tail.append(line)
+                        progress.update(task, description=f"[dim]{escape(line[:80])}[/dim]")
+            returncode = proc.wait()
+        finally:
+            watchdog.cancel()
+
+    if returncode == 0 and not timed_out.is_set():
+        _save_requirements_hash(current_hash)
         console.print("[green]Dependencies up to date[/green]")
         return True
+
+    if timed_out.is_set():
+        print_warning(f"pip install timed out after {PIP_INSTALL_TIMEOUT}s")
     else:
         print_warning("Some dependencies may have failed to install")
-        if result.stderr:
-            console.print(f"[dim]{result.stderr.strip()}[/dim]")
-        console.print()
-        console.print("Run manually if needed:")
-        console.print(f"  [cyan]pip install -r {requirements_path}[/cyan]")
-        return False
+    if output_tail:
+        pip_output = "\n".join(output_tail)
+        console.print(f"[dim]{escape(pip_output)}[/dim]")
+    console.print()
+    console.print("Run manually if needed:")
+    console.print(f"  [cyan]pip install -r {requirements_path}[/cyan]")
+    return False
 
 
 def _update_via_git(repo_root: Path) -> bool:
@@ -307,15 +522,13 @@ def _update_via_git(repo_root: Path) -> bool:
         return False
 
 
-def _fetch_manifest() -> dict | None:
+def _fetch_manifest(session: requests.Session) -> dict | None:
     """Fetch manifest.json from GitHub. Returns parsed manifest or None if unavailable."""
-    import json
-
     manifest_url = f"{GITHUB_RAW_BASE}/manifest.json"
     try:
-        response = requests.get(manifest_url, timeout=30)
+        response = session.get(manifest_url, timeout=30)
         if response.status_code == 200:
-            return json.loads(response.text)
+            return _loads(response.content)
     except Exception:
         pass
     return None
@@ -332,18 +545,125 @@ def _get_files_from_manifest(manifest: dict) -> list[str]:
     return files
 
 
+def _get_hashes_from_manifest(manifest: dict) -> dict:
+    """Extract the optional per-file sha256 hashes from manifest (path -> hash)."""
+    return {
+        file_entry["path"]: file_entry["sha256"]
+        for file_entry in manifest.get("files", [])
+        if isinstance(file_entry, dict) and file_entry.get("sha256")
+    }
+
+
+def _create_download_session() -> requests.Session:
+    """
+    Create the session used for the manifest and all file downloads.
+
+    Connections (and their TLS state) are pooled across the whole update, and
+    transient connection errors or 5xx responses are retried briefly.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    session.headers["User-Agent"] = f"WhatThePatch/{_get_version()}"
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=DOWNLOAD_WORKERS,
+        max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504)),
+    )
+    session.mount("https://", adapter)
+    return session
+
+
+def _load_etag_cache(target_dir: Path) -> dict:
+    """Load stored validators for downloaded files (filename -> etag, last_modified, sha256)."""
+    try:
+        with open(target_dir / ETAG_CACHE_FILENAME, 'rb') as f:
+            return _loads(f.read())
+    except (json.JSONDecodeError, IOError):
+        return {}
+
+
+def _save_etag_cache(target_dir: Path, etags: dict) -> None:
+    """Save validators for downloaded files."""
+    try:
+        _write_atomic(target_dir / ETAG_CACHE_FILENAME, json.dumps(etags, indent=2))
+    except IOError:
+        pass  # Next update just downloads everything again
+
+
+def _conditional_headers(dest: Path, entry: dict | None) -> dict:
+    """
+    Build If-None-Match/If-Modified-Since headers for a file.
+
+    Validators are only sent if the local file still matches the recorded
+    hash, so a deleted or locally edited file is always re-downloaded.
+    """
+    if not entry or not dest.exists():
+        return {}
+    if hashlib.sha256(dest.read_bytes()).hexdigest() != entry.get("sha256"):
+        return {}
+
+    headers = {}
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def _download_one(
+    session: requests.Session, filename: str, dest: Path, entry: dict | None
+) -> tuple[int, dict | None]:
+    """
+    Download one file from GitHub into dest (runs on a worker thread).
+
+    Returns:
+        Tuple of (HTTP status, new validator entry or None if nothing was written).
+    """
+    response = session.get(
+        f"{GITHUB_RAW_BASE}/{filename}",
+        headers=_conditional_headers(dest, entry),
+        timeout=30,
+    )
+    if response.status_code != 200:
+        return response.status_code, None
+
+    # Write to a sibling temp file and swap it in, so an interrupted
+    # update never leaves a half-written source file
+    tmp = dest.with_suffix(dest.suffix + ".tmp")
+    try:
+        tmp.write_bytes(response.content)
+        os.replace(tmp, dest)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return 200, {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "sha256": hashlib.sha256(response.content).hexdigest(),
+    }
+
+
 def _update_via_download(target_dir: Path) -> bool:
     """Update by downloading files from GitHub. Returns True on success."""
+    import concurrent.futures
+
     info_table = create_key_value_table()
     info_table.add_row("Target", str(target_dir))
     info_table.add_row("Source", f"github.com/{GITHUB_REPO}")
     console.print(info_table)
     console.print()
 
+    # One pooled session serves the manifest and every file download
+    session = _create_download_session()
+
     # Try to fetch manifest for file list, fall back to legacy list
-    manifest = _fetch_manifest()
+    manifest = _fetch_manifest(session)
+    expected_hashes = {}
     if manifest:
         files_to_update = _get_files_from_manifest(manifest)
+        expected_hashes = _get_hashes_from_manifest(manifest)
         manifest_version = manifest.get("version", "unknown")
         console.print(f"[dim]Using manifest v{manifest_version} ({len(files_to_update)} files)[/dim]")
     else:
@@ -351,42 +671,71 @@ def _update_via_download(target_dir: Path) -> bool:
         console.print(f"[dim]Using legacy file list ({len(files_to_update)} files)[/dim]")
     console.print()
 
-    # Ensure required directories exist
-    for directory in ["engines", "docs", "prompt-templates"]:
-        dir_path = target_dir / directory
-        dir_path.mkdir(parents=True, exist_ok=True)
+    # Create each parent directory once up front (also avoids concurrent mkdirs)
+    for parent in {(target_dir / filename).parent for filename in files_to_update}:
+        parent.mkdir(parents=True, exist_ok=True)
 
     updated = []
+    unchanged = []
     failed = []
     skipped = []
-
-    with get_progress_spinner() as progress:
-        task = progress.add_task("Downloading files...", total=None)
-
-        for filename in files_to_update:
-            url = f"{GITHUB_RAW_BASE}/{filename}"
-            dest = target_dir / filename
-
-            # Ensure parent directory exists for nested files
-            dest.parent.mkdir(parents=True, exist_ok=True)
-
-            progress.update(task, description=f"Downloading {filename}...")
-            try:
-                response = requests.get(url, timeout=30)
-                if response.status_code == 200:
-                    dest.write_text(response.text)
+    etags = _load_etag_cache(target_dir)
+
+    # Files whose local content already matches the manifest hash need no request
+    to_download = []
+    for filename in files_to_update:
+        dest = target_dir / filename
+        expected = expected_hashes.get(filename)
+        if expected and dest.exists() and hashlib.sha256(dest.read_bytes()).hexdigest() == expected:
+            unchanged.append(filename)
+        else:
+            to_download.append(filename)
+
+    with get_progress_spinner() as progress, session:
+        task = progress.add_task("Downloading files...", total=len(to_download))
+
+        # Fetch and write all files concurrently over the pooled session
+        with concurrent.futures.ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+            futures = {
+                executor.submit(
+                    _download_one,
+                    session,
+                    filename,
+                    target_dir / filename,
+                    etags.get(filename),
+                ): filename
+                for filename in to_download
+            }
+
+            for future in concurrent.futures.as_completed(futures):
+                filename = futures[future]
+
+                progress.advance(task)
+                try:
+                    status, entry = future.result()
+                except Exception as e:
+                    failed.append((filename, str(e)))
+                    continue
+
+                if status == 200:
+                    etags[filename] = entry
                     updated.append(filename)
-                elif response.status_code == 404:
+                elif status == 304:
+                    # Not modified upstream - local copy is current
+                    unchanged.append(filename)
+                elif status == 404:
                     # File doesn't exist in repo (may be optional)
                     skipped.append((filename, "not found in repo"))
                 else:
-                    failed.append((filename, f"HTTP {response.status_code}"))
-            except Exception as e:
-                failed.append((filename, str(e)))
+                    failed.append((filename, f"HTTP {status}"))
+
+    _save_etag_cache(target_dir, etags)
 
     # Show results
     if updated:
         console.print(f"[green]Updated:[/green] {len(updated)} files")
+    if unchanged:
+        console.print(f"[dim]Unchanged:[/dim] {len(unchanged)} files")
     if skipped:
         console.print(f"[yellow]Skipped:[/yellow] {len(skipped)} files (not in repo)")
     if failed:
@@ -396,9 +745,12 @@ def _update_via_download(target_dir: Path) -> bool:
 
     console.print()
 
-    # Consider success if we updated files and only had skips (not hard failures)
-    if updated and not failed:
-        print_success("Update complete!", {"Files updated": str(len(updated))})
+    # Consider success if files are current and we only had skips (not hard failures)
+    if (updated or unchanged) and not failed:
+        print_success("Update complete!", {
+            "Files updated": str(len(updated)),
+            "Files unchanged": str(len(unchanged)),
+        })
         return True
     elif failed:
         print_error("Some files failed to update", [
@@ -421,17 +773,11 @@ def run_update():
     console.print("[bold]Updating WhatThePatch[/bold]")
     console.print()
 
-    # Determine the script's actual location
-    script_path = Path(__file__).resolve()
-    script_dir = script_path.parent
-
-    # Check if running from installed location (~/.whatthepatch)
-    is_installed = script_dir == INSTALL_DIR
-
     update_success = False
     requirements_path = None
 
-    if is_installed:
+    # Check if running from installed location (~/.whatthepatch)
+    if _IS_INSTALLED:
         # Scenario 1: Running as CLI command from install directory
         console.print(f"[dim]Mode:[/dim] Installed CLI (wtp command)")
         console.print()
@@ -439,7 +785,7 @@ def run_update():
         requirements_path = INSTALL_DIR / "requirements.txt"
     else:
         # Running directly as .py script
-        git_root = _get_git_root(script_dir)
+        git_root = _get_git_root(_SCRIPT_DIR)
 
         if git_root:
             # Scenario 2: Running from a git repository
@@ -451,13 +797,16 @@ def run_update():
             # Scenario 3: Running as .py script but not in a git repo
             console.print(f"[dim]Mode:[/dim] Standalone script")
             console.print()
-            update_success = _update_via_download(script_dir)
-            requirements_path = script_dir / "requirements.txt"
+            update_success = _update_via_download(_SCRIPT_DIR)
+            requirements_path = _SCRIPT_DIR / "requirements.txt"
 
     # Install/update dependencies if update was successful
     if update_success and requirements_path:
         _install_requirements(requirements_path)
 
+    # Files may now exist in the install dir that were found elsewhere before
+    _found_paths.clear()
+
     # Clear update cache so next check fetches fresh data
     if UPDATE_CACHE_FILE.exists():
         try:
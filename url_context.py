@@ -11,11 +11,13 @@ This module handles:
 
 from __future__ import annotations
 
+import concurrent.futures
 import hashlib
 import json
 import os
 import re
 import time
+from functools import lru_cache
 from pathlib import Path
 from urllib.parse import urlparse
 
@@ -34,6 +36,14 @@ INSTALL_DIR = Path.home() / ".whatthepatch"
 # Context reading configuration
 CONTEXT_SIZE_WARNING_THRESHOLD = 100_000  # ~100KB
 
+# Above this many local files, reads are spread over a thread pool so disk
+# latency overlaps instead of adding up one file at a time
+PARALLEL_READ_THRESHOLD = 4
+CONTEXT_READ_WORKERS = 8
+
+# Context URLs fetched at once (they usually hit the same API host)
+CONTEXT_URL_WORKERS = 5
+
 # Directories to auto-exclude when reading context
 EXCLUDED_DIRS = {
     'node_modules', '.git', '__pycache__', '.venv', 'venv',
@@ -59,6 +69,21 @@ URL_CACHE_DIR = INSTALL_DIR / "url_cache"
 URL_CACHE_TTL = 3600  # 1 hour in seconds
 
 
+@lru_cache(maxsize=1)
+def _get_session() -> requests.Session:
+    """
+    Shared HTTP session for context URL fetches.
+
+    Keeps connections (and TLS sessions) to api.github.com and friends open
+    across URLs; sized for the CONTEXT_URL_WORKERS threads that share it.
+    """
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize=CONTEXT_URL_WORKERS)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
 def is_url(path: str) -> bool:
     """Check if a path is a URL."""
     return path.startswith(('http://', 'https://'))
@@ -132,7 +157,7 @@ def fetch_github_file_content(owner: str, repo: str, ref: str, path: str, token:
     if token:
         headers['Authorization'] = f'token {token}'
 
-    response = requests.get(api_url, headers=headers, params={'ref': ref}, timeout=30)
+    response = _get_session().get(api_url, headers=headers, params={'ref': ref}, timeout=30)
     response.raise_for_status()
 
     data = response.json()
@@ -192,7 +217,7 @@ def fetch_bitbucket_file_content(workspace: str, repo: str, ref: str, path: str,
     if username and app_password:
         auth = (username, app_password)
 
-    response = requests.get(api_url, headers=headers, auth=auth, timeout=30)
+    response = _get_session().get(api_url, headers=headers, auth=auth, timeout=30)
     response.raise_for_status()
 
     # Bitbucket returns raw file content directly
@@ -239,17 +264,22 @@ def get_cached_content(url: str, ttl: int = URL_CACHE_TTL) -> tuple[str, str, in
         if time.time() - data["fetched_at"] > ttl:
             return None  # Expired
 
-        return (data["content"], data["display_name"], len(data["content"].encode()))
+        # Entries written before "size" was stored fall back to measuring the content
+        size = data.get("size")
+        if size is None:
+            size = len(data["content"].encode())
+        return (data["content"], data["display_name"], size)
     except (json.JSONDecodeError, KeyError):
         return None
 
 
-def save_to_cache(url: str, content: str, display_name: str, content_type: str):
-    """Save fetched content to cache."""
+def save_to_cache(url: str, content: str, display_name: str, content_type: str, size: int | None = None):
+    """Save fetched content to cache (size is its UTF-8 byte length, stored so hits needn't re-encode)."""
     cache_path = get_url_cache_path(url)
     data = {
         "url": url,
         "content": content,
+        "size": size if size is not None else len(content.encode('utf-8')),
         "fetched_at": time.time(),
         "content_type": content_type,
         "display_name": display_name
@@ -258,18 +288,31 @@ def save_to_cache(url: str, content: str, display_name: str, content_type: str):
         json.dump(data, f)
 
 
+@lru_cache(maxsize=None)
+def _read_config(config_path: Path, mtime_ns: int, size: int) -> dict:
+    """Parse config.yaml; cached per (path, mtime, size) so each URL doesn't re-parse it."""
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(config_path) as f:
+        return yaml.load(f, Loader=loader) or {}
+
+
+def _load_config() -> dict | None:
+    """Load config.yaml from the install dir, or the script dir for development."""
+    for config_path in (INSTALL_DIR / "config.yaml", Path(__file__).parent / "config.yaml"):
+        try:
+            stat = config_path.stat()
+        except OSError:
+            continue
+        return _read_config(config_path, stat.st_mtime_ns, stat.st_size)
+    return None
+
+
 def get_github_token() -> str | None:
     """Get GitHub token from config if available."""
-    config_path = INSTALL_DIR / "config.yaml"
-    if not config_path.exists():
-        # Try local config
-        config_path = Path(__file__).parent / "config.yaml"
-    if not config_path.exists():
-        return None
-
     try:
-        with open(config_path) as f:
-            config = yaml.safe_load(f) or {}
+        config = _load_config()
+        if config is None:
+            return None
         token = config.get("tokens", {}).get("github", "")
         # Check if it's a real token (not a placeholder)
         if token and not token.startswith("ghp_your"):
@@ -285,16 +328,10 @@ def get_bitbucket_credentials() -> tuple[str | None, str | None]:
     Returns:
         tuple: (username, app_password) or (None, None) if not configured
     """
-    config_path = INSTALL_DIR / "config.yaml"
-    if not config_path.exists():
-        # Try local config
-        config_path = Path(__file__).parent / "config.yaml"
-    if not config_path.exists():
-        return None, None
-
     try:
-        with open(config_path) as f:
-            config = yaml.safe_load(f) or {}
+        config = _load_config()
+        if config is None:
+            return None, None
         tokens = config.get("tokens", {})
         username = tokens.get("bitbucket_username", "")
         app_password = tokens.get("bitbucket_app_password", "")
@@ -314,7 +351,8 @@ def fetch_url_content(url: str, use_cache: bool = True) -> tuple[str, str, int]:
 
     Args:
         url: The URL to fetch
-        use_cache: Whether to use caching (default True)
+        use_cache: Whether a cached copy may be returned (default True); the
+            fetched content is cached either way
 
     Returns:
         tuple: (content, display_name, size_bytes)
@@ -385,7 +423,7 @@ def fetch_url_content(url: str, use_cache: bool = True) -> tuple[str, str, int]:
         display_name = path_parts[-1] if path_parts else parsed.netloc
 
         # Fetch with timeout
-        response = requests.get(fetch_url, timeout=30, headers={
+        response = _get_session().get(fetch_url, timeout=30, headers={
             'User-Agent': f'WhatThePatch/{__version__}'
         })
         response.raise_for_status()
@@ -398,11 +436,11 @@ def fetch_url_content(url: str, use_cache: bool = True) -> tuple[str, str, int]:
         content = html_to_markdown(content)
         display_name = f"{display_name} (HTML->MD)"
 
-    size = len(content.encode('utf-8'))
+    # Byte size for the context summary; ASCII text needs no encoded copy
+    size = len(content) if content.isascii() else len(content.encode('utf-8'))
 
-    # Save to cache
-    if use_cache:
-        save_to_cache(url, content, display_name, content_type)
+    # Save to cache (also when it was bypassed, so --no-cache refreshes stale copies)
+    save_to_cache(url, content, display_name, content_type, size)
 
     return content, display_name, size
 
@@ -417,12 +455,78 @@ def should_exclude_dir(dirpath: Path) -> bool:
     return dirpath.name in EXCLUDED_DIRS
 
 
-def read_context_paths(paths: list[str]) -> tuple[str, int, int, int]:
+def read_text_file(filepath: Path) -> tuple[str, int]:
+    """
+    Read a local text file, taking its size from the open file.
+
+    Reads in text mode like Path.read_text (locale encoding, universal
+    newlines, undecodable bytes replaced).
+
+    Returns:
+        Tuple of (content, size_bytes) where size_bytes is the on-disk size,
+        so callers don't need to re-encode the content to measure it.
+    """
+    with open(filepath, errors='replace') as f:
+        size = os.fstat(f.fileno()).st_size
+        return f.read(), size
+
+
+def _read_text_files(pending: list[tuple[str, Path, bool]]):
+    """
+    Read a batch of local files, overlapping the reads when there are many.
+
+    Yields (key, filepath, report_errors, result) where result is either the
+    (content, size_bytes) tuple from read_text_file or the exception raised.
+    """
+    def read(filepath: Path):
+        try:
+            return read_text_file(filepath)
+        except Exception as e:
+            return e
+
+    if len(pending) <= PARALLEL_READ_THRESHOLD:
+        results = map(read, (filepath for _, filepath, _ in pending))
+    else:
+        workers = min(CONTEXT_READ_WORKERS, len(pending))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(read, (filepath for _, filepath, _ in pending)))
+
+    for (key, filepath, report_errors), result in zip(pending, results):
+        yield key, filepath, report_errors, result
+
+
+def _fetch_urls(urls: list[str], use_cache: bool = True) -> dict:
+    """
+    Fetch context URLs, several at a time when there is more than one.
+
+    Returns a dict mapping each distinct URL to the (content, display_name,
+    size_bytes) tuple from fetch_url_content, or the RequestException it raised.
+    Other exceptions propagate as they would from a direct call.
+    """
+    def fetch(url: str):
+        try:
+            return fetch_url_content(url, use_cache)
+        except requests.exceptions.RequestException as e:
+            return e
+
+    unique_urls = list(dict.fromkeys(urls))
+    if len(unique_urls) <= 1:
+        return {url: fetch(url) for url in unique_urls}
+
+    # Capped so a long --context list doesn't open a burst of connections
+    # against the GitHub/Bitbucket APIs
+    workers = min(CONTEXT_URL_WORKERS, len(unique_urls))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        return dict(zip(unique_urls, executor.map(fetch, unique_urls)))
+
+
+def read_context_paths(paths: list[str], use_cache: bool = True) -> tuple[str, int, int, int]:
     """
     Read content from files, directories, or URLs.
 
     Args:
         paths: List of file paths, directory paths, or URLs to read
+        use_cache: Whether URLs may be served from the URL cache (default True)
 
     Returns:
         Tuple of (formatted_content, total_size_bytes, local_count, url_count)
@@ -433,26 +537,33 @@ def read_context_paths(paths: list[str]) -> tuple[str, int, int, int]:
     errors = []
     local_count = 0
     url_count = 0
+    # Local files are collected first and read in one batch below, as
+    # (display_key, filepath, report_errors) tuples
+    pending_files: list[tuple[str, Path, bool]] = []
+
+    # URLs are fetched together up front; results are handled in argument order
+    url_results = _fetch_urls([path_str for path_str in paths if is_url(path_str)], use_cache)
 
     for path_str in paths:
         if is_url(path_str):
             # Handle URL
-            try:
-                content, display_name, size = fetch_url_content(path_str)
-                url_content.append((display_name, content))
-                total_size += size
-                url_count += 1
-            except requests.exceptions.HTTPError as e:
-                if e.response.status_code == 404:
+            result = url_results[path_str]
+            if isinstance(result, requests.exceptions.HTTPError):
+                if result.response.status_code == 404:
                     errors.append(f"URL not found: {path_str}")
-                elif e.response.status_code == 403:
+                elif result.response.status_code == 403:
                     errors.append(f"Access denied: {path_str} (may require authentication)")
                 else:
-                    errors.append(f"HTTP {e.response.status_code}: {path_str}")
-            except requests.exceptions.Timeout:
+                    errors.append(f"HTTP {result.response.status_code}: {path_str}")
+            elif isinstance(result, requests.exceptions.Timeout):
                 errors.append(f"Timeout fetching URL: {path_str}")
-            except requests.exceptions.RequestException as e:
-                errors.append(f"Failed to fetch URL: {path_str} ({e})")
+            elif isinstance(result, requests.exceptions.RequestException):
+                errors.append(f"Failed to fetch URL: {path_str} ({result})")
+            else:
+                content, display_name, size = result
+                url_content.append((display_name, content))
+                total_size += size
+                url_count += 1
         else:
             # Handle local path
             path = Path(path_str).expanduser().resolve()
@@ -464,13 +575,7 @@ def read_context_paths(paths: list[str]) -> tuple[str, int, int, int]:
             if path.is_file():
                 # Single file
                 if is_text_file(path):
-                    try:
-                        content = path.read_text(errors='replace')
-                        files_content[str(path)] = content
-                        total_size += len(content.encode('utf-8'))
-                        local_count += 1
-                    except Exception as e:
-                        errors.append(f"Could not read {path}: {e}")
+                    pending_files.append((str(path), path, True))
                 else:
                     errors.append(f"Skipped binary file: {path}")
 
@@ -485,16 +590,20 @@ def read_context_paths(paths: list[str]) -> tuple[str, int, int, int]:
                     for filename in files:
                         filepath = root_path / filename
                         if is_text_file(filepath):
-                            try:
-                                content = filepath.read_text(errors='replace')
-                                # Use relative path from the provided context root
-                                relative_path = filepath.relative_to(path.parent)
-                                files_content[str(relative_path)] = content
-                                total_size += len(content.encode('utf-8'))
-                                local_count += 1
-                            except Exception:
-                                # Silently skip files that can't be read
-                                pass
+                            # Use relative path from the provided context root
+                            relative_path = filepath.relative_to(path.parent)
+                            # Unreadable files inside directories are skipped silently
+                            pending_files.append((str(relative_path), filepath, False))
+
+    for key, filepath, report_errors, result in _read_text_files(pending_files):
+        if isinstance(result, Exception):
+            if report_errors:
+                errors.append(f"Could not read {filepath}: {result}")
+            continue
+        content, size = result
+        files_content[key] = content
+        total_size += size
+        local_count += 1
 
     # Report errors
     if errors:
@@ -509,6 +618,20 @@ def read_context_paths(paths: list[str]) -> tuple[str, int, int, int]:
     return format_context_content(files_content, url_content), total_size, local_count, url_count
 
 
+# Code fence language by file extension, for formatted context
+_FENCE_LANGUAGES = {
+    '.py': 'python', '.js': 'javascript', '.ts': 'typescript',
+    '.tsx': 'tsx', '.jsx': 'jsx', '.java': 'java', '.go': 'go',
+    '.rs': 'rust', '.rb': 'ruby', '.php': 'php', '.cs': 'csharp',
+    '.cpp': 'cpp', '.c': 'c', '.h': 'c', '.hpp': 'cpp',
+    '.swift': 'swift', '.kt': 'kotlin', '.scala': 'scala',
+    '.sh': 'bash', '.bash': 'bash', '.zsh': 'zsh',
+    '.yaml': 'yaml', '.yml': 'yaml', '.json': 'json',
+    '.xml': 'xml', '.html': 'html', '.css': 'css',
+    '.sql': 'sql', '.md': 'markdown', '.graphql': 'graphql',
+}
+
+
 def format_context_content(files: dict[str, str], urls: list[tuple[str, str]] | None = None) -> str:
     """Format file and URL contents with clear separators for the AI prompt.
 
@@ -521,19 +644,7 @@ def format_context_content(files: dict[str, str], urls: list[tuple[str, str]] |
     # Format local files
     for filepath, content in sorted(files.items()):
         # Detect language from extension for code fence
-        ext = Path(filepath).suffix.lower()
-        lang_map = {
-            '.py': 'python', '.js': 'javascript', '.ts': 'typescript',
-            '.tsx': 'tsx', '.jsx': 'jsx', '.java': 'java', '.go': 'go',
-            '.rs': 'rust', '.rb': 'ruby', '.php': 'php', '.cs': 'csharp',
-            '.cpp': 'cpp', '.c': 'c', '.h': 'c', '.hpp': 'cpp',
-            '.swift': 'swift', '.kt': 'kotlin', '.scala': 'scala',
-            '.sh': 'bash', '.bash': 'bash', '.zsh': 'zsh',
-            '.yaml': 'yaml', '.yml': 'yaml', '.json': 'json',
-            '.xml': 'xml', '.html': 'html', '.css': 'css',
-            '.sql': 'sql', '.md': 'markdown', '.graphql': 'graphql',
-        }
-        lang = lang_map.get(ext, '')
+        lang = _FENCE_LANGUAGES.get(Path(filepath).suffix.lower(), '')
 
         lines.append(f"### File: {filepath}")
         lines.append(f"```{lang}")
@@ -546,22 +657,11 @@ def format_context_content(files: dict[str, str], urls: list[tuple[str, str]] |
         for display_name, content in urls:
             # Try to detect language from display name extension
             ext = Path(display_name.split(' ')[0]).suffix.lower()  # Handle "(HTML->MD)" suffix
-            lang_map = {
-                '.py': 'python', '.js': 'javascript', '.ts': 'typescript',
-                '.tsx': 'tsx', '.jsx': 'jsx', '.java': 'java', '.go': 'go',
-                '.rs': 'rust', '.rb': 'ruby', '.php': 'php', '.cs': 'csharp',
-                '.cpp': 'cpp', '.c': 'c', '.h': 'c', '.hpp': 'cpp',
-                '.swift': 'swift', '.kt': 'kotlin', '.scala': 'scala',
-                '.sh': 'bash', '.bash': 'bash', '.zsh': 'zsh',
-                '.yaml': 'yaml', '.yml': 'yaml', '.json': 'json',
-                '.xml': 'xml', '.html': 'markdown', '.css': 'css',
-                '.sql': 'sql', '.md': 'markdown', '.graphql': 'graphql',
-            }
-            # HTML->MD content should be rendered as markdown
-            if '(HTML->MD)' in display_name:
+            # HTML->MD content (and fetched .html pages) should be rendered as markdown
+            if '(HTML->MD)' in display_name or ext == '.html':
                 lang = 'markdown'
             else:
-                lang = lang_map.get(ext, '')
+                lang = _FENCE_LANGUAGES.get(ext, '')
 
             lines.append(f"### URL: {display_name}")
             lines.append(f"```{lang}")
@@ -18,28 +18,35 @@ from __future__ import annotations
 
 __version__ = "1.3.3"
 
-import argparse
-import re
 import sys
-from pathlib import Path
-
-# Track missing dependencies for helpful error messages
-_MISSING_DEPS = []
 
-try:
-    import requests
-except ImportError:
-    _MISSING_DEPS.append("requests")
+# Answer --version before importing anything else (Rich, the command modules,
+# the dependency check); it's the one command that needs none of them
+if __name__ == "__main__" and len(sys.argv) == 2 and sys.argv[1] in ("--version", "-V"):
+    print(f"wtp v{__version__}")
+    raise SystemExit(0)
 
-try:
-    import yaml
-except ImportError:
-    _MISSING_DEPS.append("pyyaml")
+import argparse
+import concurrent.futures
+import importlib.util
+import os
+import re
+import threading
+from functools import lru_cache
+from pathlib import Path
 
-try:
-    import html2text
-except ImportError:
-    _MISSING_DEPS.append("html2text")
+# Track missing dependencies for helpful error messages.
+# Dependencies are only located here, not imported; the modules that need
+# them import them on first use so utility commands start fast.
+_MISSING_DEPS = [
+    package
+    for module, package in (
+        ("requests", "requests"),
+        ("yaml", "pyyaml"),
+        ("html2text", "html2text"),
+    )
+    if importlib.util.find_spec(module) is None
+]
 
 # Check for missing dependencies before proceeding
 if _MISSING_DEPS:
@@ -52,72 +59,67 @@ if _MISSING_DEPS:
     print("Run 'pip install -r requirements.txt' to install them.\n")
     sys.exit(1)
 
-from banner import print_banner
+from rich.console import Console
+
 from cli_utils import (
     console,
-    print_error,
-    print_warning,
-    print_success,
-    print_info,
-    print_panel,
-    print_commands,
     create_key_value_table,
-    create_status_table,
-    format_status,
-    format_active,
     format_dim,
     format_highlight,
-    format_value,
     get_progress_spinner,
-    confirm,
-)
-from rich.panel import Panel
-
-# URL and context handling
-from url_context import (
-    is_url,
-    read_context_paths,
-    format_context_content,
-    check_context_size,
-    fetch_url_content,
-    get_github_token,
-    get_bitbucket_credentials,
-    CONTEXT_SIZE_WARNING_THRESHOLD,
-    EXCLUDED_DIRS,
-    BINARY_EXTENSIONS,
-)
-
-# PR providers - GitHub and Bitbucket
-from pr_providers import (
-    parse_pr_url,
-    fetch_github_pr,
-    fetch_bitbucket_pr,
-    extract_ticket_id,
-    sanitize_filename,
+    print_success,
 )
 
-# CLI commands
-from commands import (
-    run_config_test,
-    show_status,
-    get_engine_config_status,
-    get_engine_model,
-    get_available_models,
-    switch_engine,
-    switch_output,
-    switch_model,
-    show_prompt,
-    edit_prompt,
-    edit_config,
-    ENGINE_DEFAULT_MODELS,
-)
-
-# Output handling
-from output import (
-    save_review,
-    convert_to_html,
-    auto_open_file,
-)
+# Names re-exported from the command, provider and output modules, resolved on
+# first access by __getattr__ below. Importing them eagerly would load
+# requests, html2text and the command implementations on every invocation,
+# including --help and --version; functions here import what they use.
+_LAZY_EXPORTS = {
+    # URL and context handling
+    **dict.fromkeys((
+        "is_url",
+        "read_context_paths",
+        "format_context_content",
+        "check_context_size",
+        "fetch_url_content",
+        "get_github_token",
+        "get_bitbucket_credentials",
+        "CONTEXT_SIZE_WARNING_THRESHOLD",
+        "EXCLUDED_DIRS",
+        "BINARY_EXTENSIONS",
+    ), "url_context"),
+    # PR providers - GitHub and Bitbucket
+    **dict.fromkeys((
+        "parse_pr_url",
+        "fetch_github_pr",
+        "fetch_bitbucket_pr",
+        "extract_ticket_id",
+        "sanitize_filename",
+    ), "pr_providers"),
+    # CLI commands
+    **dict.fromkeys((
+        "run_config_test",
+        "show_status",
+        "get_engine_config_status",
+        "get_engine_model",
+        "get_available_models",
+        "get_active_engine",
+        "switch_engine",
+        "switch_output",
+        "switch_model",
+        "ConfigSession",
+        "show_prompt",
+        "edit_prompt",
+        "edit_config",
+        "ENGINE_DEFAULT_MODELS",
+    ), "commands"),
+    # Output handling
+    **dict.fromkeys((
+        "save_review",
+        "convert_to_html",
+        "auto_open_file",
+    ), "output"),
+}
 
 # Update system
 from update import (
@@ -125,6 +127,7 @@ from update import (
     get_file_path,
     parse_version,
     check_for_updates,
+    start_update_check,
     show_update_notification,
     run_update,
 )
@@ -136,11 +139,41 @@ if INSTALL_DIR.exists():
 sys.path.insert(0, str(Path(__file__).parent))
 
 
+def __getattr__(name: str):
+    """Resolve the lazily imported re-exports listed in _LAZY_EXPORTS."""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+@lru_cache(maxsize=None)
+def _read_prompt_file(path: Path, mtime_ns: int, size: int) -> str:
+    """Read prompt.md; cached per (path, mtime, size) so edits invalidate it."""
+    return path.read_text()
+
+
+@lru_cache(maxsize=None)
+def _read_config_file(path: Path, mtime_ns: int, size: int) -> dict:
+    """Parse config.yaml; cached per (path, mtime, size) so edits invalidate it."""
+    import yaml
+
+    # libyaml's C loader when PyYAML was built with it; same safe semantics
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(path) as f:
+        return yaml.load(f, Loader=loader)
+
+
 def load_prompt_template() -> str:
     """Load the review prompt template from prompt.md"""
     prompt_path = get_file_path("prompt.md")
 
-    if not prompt_path.exists():
+    # One stat serves as both the existence check and the cache key
+    try:
+        stat = prompt_path.stat()
+    except FileNotFoundError:
         from cli_utils import print_cli_error
         print_cli_error(
             f"prompt.md not found at [yellow]{prompt_path}[/yellow]",
@@ -148,14 +181,21 @@ def load_prompt_template() -> str:
         )
         sys.exit(1)
 
-    return prompt_path.read_text()
+    return _read_prompt_file(prompt_path, stat.st_mtime_ns, stat.st_size)
 
 
 def load_config() -> dict:
-    """Load configuration from config.yaml"""
+    """Load configuration from config.yaml
+
+    The parsed config is shared across calls until the file changes on disk,
+    so callers should treat it as read-only.
+    """
     config_path = get_file_path("config.yaml")
 
-    if not config_path.exists():
+    # One stat serves as both the existence check and the cache key
+    try:
+        stat = config_path.stat()
+    except FileNotFoundError:
         from cli_utils import print_cli_error
         print_cli_error(
             f"config.yaml not found at [yellow]{config_path}[/yellow]",
@@ -163,9 +203,7 @@ def load_config() -> dict:
         )
         sys.exit(1)
 
-    with open(config_path) as f:
-        return yaml.safe_load(f)
-
+    return _read_config_file(config_path, stat.st_mtime_ns, stat.st_size)
 
 
 def generate_review(
@@ -173,10 +211,15 @@ def generate_review(
     ticket_id: str,
     config: dict,
     external_context: str = "",
+    engine=None,
 ) -> str:
-    """Generate PR review using configured engine."""
+    """Generate PR review using configured engine.
+
+    If engine is given (already built by the caller), it is used instead of
+    looking up the active engine again.
+    """
     try:
-        from engines import get_engine, EngineError
+        from engines import EngineError
     except ImportError as e:
         from cli_utils import print_cli_error
         print_cli_error(
@@ -185,11 +228,13 @@ def generate_review(
         )
         sys.exit(1)
 
-    engine_name = config.get("engine", "claude-api")
     prompt_template = load_prompt_template()
 
     try:
-        engine = get_engine(engine_name, config)
+        if engine is None:
+            from commands import get_active_engine
+            from engines import get_engine
+            engine = get_engine(get_active_engine(config), config)
         return engine.generate_review(pr_data, ticket_id, prompt_template, external_context)
     except EngineError as e:
         from cli_utils import print_cli_error
@@ -198,31 +243,57 @@ def generate_review(
 
 
 
+def fetch_pr(pr_info: dict, config: dict, use_cache: bool = True) -> dict:
+    """Fetch PR details and diff from the platform identified by parse_pr_url.
+
+    --dry-run uses the same fetch: the fetchers only request PR metadata and
+    the diff (plus the paginated files API for oversized diffs), and the dry
+    run reports diff lines, diff size and prompt size from exactly that data.
+    """
+    from pr_providers import fetch_github_pr, fetch_bitbucket_pr
+
+    if pr_info["platform"] == "github":
+        return fetch_github_pr(
+            pr_info["owner"],
+            pr_info["repo"],
+            pr_info["pr_number"],
+            config["tokens"]["github"],
+            use_cache,
+        )
+    return fetch_bitbucket_pr(
+        pr_info["owner"],
+        pr_info["repo"],
+        pr_info["pr_number"],
+        config["tokens"]["bitbucket_username"],
+        config["tokens"]["bitbucket_app_password"],
+        use_cache,
+    )
+
+
+# Argument names in argparse errors, e.g. "argument --foo/-f" or "argument --foo"
+_ARGUMENT_NAME_PATTERN = re.compile(r'argument (--[\w-]+(?:/-\w+)?)')
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
 class WTPArgumentParser(argparse.ArgumentParser):
     """Custom argument parser with improved error formatting."""
 
     def error(self, message):
         """Display a formatted error message with highlighting."""
-        import re
-        from rich.console import Console
-
         # Use a console that writes to stderr with force_terminal for colors
         err_console = Console(stderr=True, force_terminal=True)
 
         # Highlight the argument name in the error message
-        # Pattern matches: argument --foo/-f or argument --foo
-        highlighted_message = re.sub(
-            r'argument (--[\w-]+(?:/-\w+)?)',
-            r'argument [bold yellow]\1[/bold yellow]',
-            message
+        highlighted_message = _ARGUMENT_NAME_PATTERN.sub(
+            r'argument [bold yellow]\1[/bold yellow]', message
         )
         err_console.print()
         err_console.print(f"[bold red]Error:[/bold red] {highlighted_message}")
         err_console.print()
 
         # Format usage on a single line for cleaner display
-        usage = self.format_usage().replace('usage: ', '').replace('\n', ' ')
-        usage = re.sub(r'\s+', ' ', usage).strip()
+        usage = self.format_usage().replace('usage: ', '')
+        usage = _WHITESPACE_PATTERN.sub(' ', usage).strip()
         err_console.print(f"[dim]Usage:[/dim] [cyan]{usage}[/cyan]", highlight=False)
         err_console.print()
         err_console.print("[dim]Run[/dim] [cyan]wtp --help[/cyan] [dim]for more information.[/dim]")
@@ -230,15 +301,100 @@ class WTPArgumentParser(argparse.ArgumentParser):
         sys.exit(2)
 
 
+def run_switches(switches: list) -> None:
+    """Run one or more switch_* commands; several share one config write."""
+    from commands import ConfigSession
+
+    config_path = get_file_path("config.yaml")
+    if len(switches) == 1 or not config_path.exists():
+        # A single switch saves on its own (and reports a missing config)
+        switches[0]()
+        return
+    # e.g. --switch-engine --switch-model: run each in turn, write config.yaml once
+    with ConfigSession(config_path) as session:
+        for switcher in switches:
+            switcher(session)
+
+
+def run_utility_command(args: argparse.Namespace) -> bool:
+    """
+    Dispatch the non-review flags from a table. Returns True if one ran.
+
+    Flags are checked in priority order and only the first one runs, except
+    the --switch-* flags, which combine (see run_switches).
+    """
+    from commands import (
+        edit_config,
+        edit_prompt,
+        run_config_test,
+        show_prompt,
+        show_status,
+        switch_engine,
+        switch_model,
+        switch_output,
+    )
+
+    # (flag, handler, show update notification afterwards)
+    handlers = (
+        (args.update, run_update, False),
+        (args.show_prompt, show_prompt, False),
+        (args.edit_prompt, edit_prompt, False),
+        (args.edit_config, edit_config, False),
+        (args.status, show_status, True),
+    )
+    for flag, handler, notify in handlers:
+        if flag:
+            handler()
+            if notify:
+                show_update_notification()
+            return True
+
+    switches = [
+        switcher
+        for flag, switcher in (
+            (args.switch_engine, switch_engine),
+            (args.switch_model, switch_model),
+            (args.switch_output, switch_output),
+        )
+        if flag
+    ]
+    if switches:
+        run_switches(switches)
+        show_update_notification()
+        return True
+
+    if args.test_config:
+        success = run_config_test()
+        show_update_notification()
+        sys.exit(0 if success else 1)
+
+    return False
+
+
 def main():
-    # Show banner for help
-    if len(sys.argv) == 1 or "-h" in sys.argv or "--help" in sys.argv:
+    # Fast path for a single-flag invocation that doesn't need the full parser
+    # (--version is answered at the top of the module when run as a script)
+    if len(sys.argv) == 2 and sys.argv[1] == "--show-prompt":
+        from commands import show_prompt
+        show_prompt()
+        return
+
+    # Show banner for help. Only on a terminal: the banner is raw ANSI art,
+    # which is just noise when help is piped or captured by a completion script
+    argv = sys.argv[1:]
+    showing_help = not argv or any(arg in ("-h", "--help") for arg in argv)
+    if showing_help and sys.stdout.isatty():
+        from banner import print_banner
         print_banner()
 
-    # Check for incomplete installation (missing files from partial update)
-    from engines import check_incomplete_installation
-    incomplete_warning = check_incomplete_installation()
+    # Check for incomplete installation (missing files from partial update);
+    # help output doesn't touch the engines, so it skips the check
+    incomplete_warning = None
+    if not showing_help:
+        from engines import check_incomplete_installation
+        incomplete_warning = check_incomplete_installation()
     if incomplete_warning:
+        from rich.panel import Panel
         console.print()
         console.print(Panel(
             incomplete_warning,
@@ -296,6 +452,11 @@ Author:
         action="store_true",
         help="Don't auto-open the output file after generation",
     )
+    review_group.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-download the PR and context URLs instead of using cached copies",
+    )
     review_group.add_argument(
         "--dry-run",
         action="store_true",
@@ -363,78 +524,58 @@ Author:
     args = parser.parse_args()
 
     # Handle special commands
-    if args.update:
-        run_update()
+    if run_utility_command(args):
         return
 
-    if args.show_prompt:
-        show_prompt()
-        return
+    if not args.review:
+        parser.print_help()
+        sys.exit(1)
 
-    if args.edit_prompt:
-        edit_prompt()
-        return
+    from rich.markup import escape
+    from rich.panel import Panel
+    from commands import get_active_engine
 
-    if args.edit_config:
-        edit_config()
-        return
+    from output import save_review, auto_open_file
+    from pr_providers import parse_pr_url, extract_ticket_id
+    from url_context import read_context_paths, check_context_size
 
-    if args.status:
-        show_status()
-        show_update_notification()
-        return
+    # Validate the PR URL first: a typo fails immediately, before the config
+    # is loaded or the spinner starts
+    pr_info = parse_pr_url(args.review)
 
-    if args.switch_engine:
-        switch_engine()
-        show_update_notification()
-        return
+    console.print()
+    config = load_config()
 
-    if args.switch_output:
-        switch_output()
-        show_update_notification()
-        return
+    # Refresh the update cache while the PR is fetched and reviewed
+    start_update_check()
 
-    if args.switch_model:
-        switch_model()
-        show_update_notification()
-        return
+    # Fetch PR data and external context concurrently with progress spinner
+    pr_data = None
+    external_context = ""
+    context_size = 0
+    local_count = url_count = 0
 
-    if args.test_config:
-        success = run_config_test()
-        show_update_notification()
-        sys.exit(0 if success else 1)
+    # One spinner for the whole review; it is paused while panels and prompts
+    # are shown and each phase swaps in its own task
+    progress = get_progress_spinner()
 
-    if not args.review:
-        parser.print_help()
-        sys.exit(1)
+    with progress:
+        description = f"Fetching PR #{pr_info['pr_number']}..."
+        if args.context:
+            description = f"Fetching PR #{pr_info['pr_number']} and reading external context..."
+        task = progress.add_task(description, total=None)
 
-    console.print()
-    config = load_config()
+        # Both are network/disk bound and independent, so overlap them
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            use_cache = not args.no_cache
+            pr_future = executor.submit(fetch_pr, pr_info, config, use_cache)
+            context_future = executor.submit(read_context_paths, args.context, use_cache) if args.context else None
 
-    # Fetch PR data with progress spinner
-    pr_info = None
-    pr_data = None
+            pr_data = pr_future.result()
+            if context_future is not None:
+                external_context, context_size, local_count, url_count = context_future.result()
 
-    with get_progress_spinner() as progress:
-        task = progress.add_task("Parsing PR URL...", total=None)
-        pr_info = parse_pr_url(args.review)
-
-        progress.update(task, description=f"Fetching PR #{pr_info['pr_number']}...")
-        if pr_info["platform"] == "github":
-            pr_data = fetch_github_pr(
-                pr_info["owner"],
-                pr_info["repo"],
-                pr_info["pr_number"],
-                config["tokens"]["github"],
-            )
-        else:
-            pr_data = fetch_bitbucket_pr(
-                pr_info["owner"],
-                pr_info["repo"],
-                pr_info["pr_number"],
-                config["tokens"]["bitbucket_username"],
-                config["tokens"]["bitbucket_app_password"],
-            )
+        progress.remove_task(task)
 
     # Add PR URL to data for template
     pr_data["pr_url"] = args.review
@@ -445,46 +586,49 @@ Author:
         config["ticket"]["fallback"],
     )
 
+    # Line count is one C-level scan; the byte size comes from the fetcher
     diff_lines = pr_data["diff"].count("\n")
-    diff_size_kb = len(pr_data["diff"].encode('utf-8')) / 1024
+    diff_size_kb = pr_data["diff_size"] / 1024
 
-    # Display PR info panel
-    pr_table = create_key_value_table()
+    # Display PR info panel. Titles, authors and branch names come from the
+    # PR itself, so escape them rather than letting Rich parse "[...]" as markup.
     pr_number = pr_info["pr_number"]
-    pr_table.add_row("PR", f"{format_highlight(f'#{pr_number}')} {pr_data['title']}")
-    pr_table.add_row("Author", pr_data.get("author", "Unknown"))
-    pr_table.add_row("Branch", f"{format_dim(pr_data['source_branch'])} -> {format_dim(pr_data['target_branch'])}")
-    pr_table.add_row("Ticket", format_highlight(ticket_id))
-    pr_table.add_row("Diff", f"{diff_lines} lines ({diff_size_kb:.1f} KB)")
+    source_branch = format_dim(escape(pr_data["source_branch"]))
+    target_branch = format_dim(escape(pr_data["target_branch"]))
+    pr_table = create_key_value_table((
+        ("PR", f"{format_highlight(f'#{pr_number}')} {escape(pr_data['title'])}"),
+        ("Author", escape(pr_data.get("author", "Unknown"))),
+        ("Branch", f"{source_branch} -> {target_branch}"),
+        ("Ticket", format_highlight(escape(ticket_id))),
+        ("Diff", f"{diff_lines} lines ({diff_size_kb:.1f} KB)"),
+    ))
 
     console.print(Panel(pr_table, title="[bold]Pull Request[/bold]", border_style="cyan"))
 
-    # Handle external context if provided
-    external_context = ""
-    context_size = 0
-    if args.context:
-        with get_progress_spinner() as progress:
-            progress.add_task("Reading external context...", total=None)
-            external_context, context_size, local_count, url_count = read_context_paths(args.context)
-
-        if context_size > 0:
-            context_table = create_key_value_table()
-            context_table.add_row("Paths", str(len(args.context)))
-            # Show local vs URL breakdown
-            if url_count > 0 and local_count > 0:
-                context_table.add_row("Sources", f"{local_count} local, {url_count} URL")
-            elif url_count > 0:
-                context_table.add_row("Sources", f"{url_count} URL")
-            else:
-                context_table.add_row("Sources", f"{local_count} local")
-            context_table.add_row("Size", f"{context_size / 1024:.1f} KB")
-            console.print(Panel(context_table, title="[bold]External Context[/bold]", border_style="blue"))
-
-            if not check_context_size(context_size):
-                console.print(format_dim("Aborted."))
-                sys.exit(0)
-
-    engine_name = config.get("engine", "claude-api")
+    # Show external context summary if provided
+    if context_size > 0:
+        # Show local vs URL breakdown
+        if url_count > 0 and local_count > 0:
+            sources = f"{local_count} local, {url_count} URL"
+        elif url_count > 0:
+            sources = f"{url_count} URL"
+        else:
+            sources = f"{local_count} local"
+        context_table = create_key_value_table((
+            ("Paths", str(len(args.context))),
+            ("Sources", sources),
+            ("Size", f"{context_size / 1024:.1f} KB"),
+        ))
+        console.print(Panel(context_table, title="[bold]External Context[/bold]", border_style="blue"))
+
+        if not check_context_size(context_size):
+            console.print(format_dim("Aborted."))
+            sys.exit(0)
+
+    # Built once here and handed to generate_review; if it fails, generate_review
+    # retries the lookup and reports the error properly
+    engine_name = get_active_engine(config)
+    engine = None
     try:
         from engines import get_engine
         engine = get_engine(engine_name, config)
@@ -492,69 +636,65 @@ Author:
     except Exception:
         engine_label = engine_name
 
-    # Build the prompt for dry-run or verbose display
+    # Summarise the prompt for dry-run or verbose display. Only the preview is
+    # materialised; the engine builds (or streams) the full prompt itself.
     if args.dry_run or args.verbose:
-        prompt_template = load_prompt_template()
-        context_section = external_context if external_context else "No external context provided."
-        full_prompt = prompt_template.format(
-            ticket_id=ticket_id,
-            pr_title=pr_data["title"],
-            pr_url=pr_data.get("pr_url", ""),
-            pr_author=pr_data.get("author", "Unknown"),
-            source_branch=pr_data["source_branch"],
-            target_branch=pr_data["target_branch"],
-            pr_description=pr_data["description"],
-            diff=pr_data["diff"],
-            external_context=context_section,
+        from engines import preview_prompt
+        prompt_preview, prompt_chars, prompt_size = preview_prompt(
+            pr_data, ticket_id, load_prompt_template(), external_context, limit=3000
         )
-        prompt_size = len(full_prompt.encode('utf-8'))
 
         if args.verbose:
             console.print(Panel(
-                f"{full_prompt[:3000]}{'...' if len(full_prompt) > 3000 else ''}\n\n"
-                f"[dim]({len(full_prompt):,} characters total)[/dim]",
+                f"{prompt_preview}{'...' if prompt_chars > 3000 else ''}\n\n"
+                f"[dim]({prompt_chars:,} characters total)[/dim]",
                 title="[bold]Prompt Preview[/bold]",
                 border_style="yellow"
             ))
 
         if args.dry_run:
-            dry_run_table = create_key_value_table()
-            dry_run_table.add_row("Engine", engine_label)
-            dry_run_table.add_row("Prompt size", f"{prompt_size:,} bytes ({prompt_size / 1024:.1f} KB)")
-            dry_run_table.add_row("Diff lines", str(diff_lines))
-            dry_run_table.add_row("External context", f"{context_size / 1024:.1f} KB" if args.context else "None")
+            dry_run_table = create_key_value_table((
+                ("Engine", engine_label),
+                ("Prompt size", f"{prompt_size:,} bytes ({prompt_size / 1024:.1f} KB)"),
+                ("Diff lines", str(diff_lines)),
+                ("External context", f"{context_size / 1024:.1f} KB" if args.context else "None"),
+            ))
 
             console.print(Panel(dry_run_table, title="[bold yellow]Dry Run[/bold yellow]", border_style="yellow"))
             console.print()
             console.print("[yellow]No API call made.[/yellow] Remove --dry-run to generate review.")
             return
 
-    # Generate review with progress spinner
-    review = None
-    with get_progress_spinner() as progress:
-        progress.add_task(f"Generating review with {engine_label}...", total=None)
-        review = generate_review(pr_data, ticket_id, config, external_context)
-
-    # Save review
+    # Generate and save the review under the same spinner
     output_format = args.format or config.get("output", {}).get("format", "html")
-    with get_progress_spinner() as progress:
-        progress.add_task(f"Saving review ({output_format})...", total=None)
+    with progress:
+        task = progress.add_task(f"Generating review with {engine_label}...", total=None)
+        review = generate_review(pr_data, ticket_id, config, external_context, engine=engine)
+
+        progress.update(task, description=f"Saving review ({output_format})...")
         output_path = save_review(review, pr_info, ticket_id, pr_data, config, output_format)
 
     # Success message
     print_success("Review complete!", {
-        "Output": str(output_path),
+        "Output": os.fspath(output_path),
         "Format": output_format.upper()
     })
 
-    # Auto-open file if enabled
+    # Auto-open file if enabled. Launching the viewer can block for a while
+    # (open/xdg-open/startfile), so it runs alongside the update check. The
+    # thread is non-daemon so the interpreter still waits for it at exit.
     auto_open = config.get("output", {}).get("auto_open", True)
+    opener = None
     if auto_open and not args.no_open:
-        auto_open_file(output_path)
+        opener = threading.Thread(target=auto_open_file, args=(output_path,), name="wtp-auto-open")
+        opener.start()
 
     # Check for updates
     show_update_notification()
 
+    if opener is not None:
+        opener.join()
+
 
 if __name__ == "__main__":
     try: